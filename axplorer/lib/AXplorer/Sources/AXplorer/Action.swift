@@ -255,7 +255,7 @@ struct Action {
         )
     }
     
-    /// Types a string of text with natural timing between keystrokes
+    /// Types a string of text, posting runs of plain characters as single keyboard events
     /// - Parameter text: The text to type
     /// - Returns: True if successful, false otherwise
     static func typeText(_ text: String) -> Bool {
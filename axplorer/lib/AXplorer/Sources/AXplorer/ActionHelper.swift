@@ -23,6 +23,13 @@ enum ActionHelper {
         "home": 115, "end": 119, "pageup": 116, "pagedown": 121,
         "space": 49
     ]
+
+    /// Key codes used directly by `typeText`
+    private static let returnKeyCode: CGKeyCode = 36
+    private static let tabKeyCode: CGKeyCode = 48
+
+    /// Longest UTF-16 string the window server delivers from a single keyboard event
+    private static let maxUnicodeRunLength = 20
     
     /// Maps modifier key names to their CGEventFlags
     private static let modifierFlags: [String: CGEventFlags] = [
@@ -46,6 +53,10 @@ enum ActionHelper {
         let distance = hypot(position.x - startPos.x, position.y - startPos.y)
         let steps = max(Int(distance / 10), 1) // One step per 10 pixels, minimum 1 step
         
+        // One mouse-moved event is reused for every step; only its location changes
+        guard let moveEvent = CGEvent(mouseEventSource: source, mouseType: .mouseMoved,
+                                      mouseCursorPosition: startPos, mouseButton: .left) else { return nil }
+        
         // Generate interpolation points with slight randomization
         for i in 1...steps {
             let progress = Double(i) / Double(steps)
@@ -57,21 +68,14 @@ enum ActionHelper {
             let x = startPos.x + (position.x - startPos.x) * easedProgress + Double.random(in: -2...2)
             let y = startPos.y + (position.y - startPos.y) * easedProgress + Double.random(in: -2...2)
             
-            let intermediatePos = CGPoint(x: x, y: y)
-            if let event = CGEvent(mouseEventSource: source, mouseType: .mouseMoved, 
-                                 mouseCursorPosition: intermediatePos, mouseButton: .left) {
-                event.post(tap: CGEventTapLocation.cghidEventTap)
-            }
+            repost(moveEvent, location: CGPoint(x: x, y: y))
             
             // Random small delay between movements (10-20ms)
             usleep(UInt32.random(in: 10000...20000))
         }
         
         // Final movement to exact target position
-        if let finalEvent = CGEvent(mouseEventSource: source, mouseType: .mouseMoved, 
-                                   mouseCursorPosition: position, mouseButton: .left) {
-            finalEvent.post(tap: CGEventTapLocation.cghidEventTap)
-        }
+        repost(moveEvent, location: position)
         
         // Return the final position
         return getMouseLocation()
@@ -251,16 +255,8 @@ enum ActionHelper {
         let source = CGEventSource(stateID: .hidSystemState)
         
         // Handle special keys
-        if let keyCode = specialKeyMap[key.lowercased()] {
-            if let keyDown = CGEvent(keyboardEventSource: source, virtualKey: keyCode, keyDown: true) {
-                keyDown.post(tap: .cghidEventTap)
-            }
-            
-            keyPressDelay()
-            
-            if let keyUp = CGEvent(keyboardEventSource: source, virtualKey: keyCode, keyDown: false) {
-                keyUp.post(tap: .cghidEventTap)
-            }
+        if let keyCode = getKeyCode(key) {
+            postKeyCode(keyCode, source: source)
             return
         }
         
@@ -291,18 +287,8 @@ enum ActionHelper {
         let modifierFlags = getModifierFlags(modifiers)
         
         // Handle special keys
-        if let keyCode = specialKeyMap[key.lowercased()] {
-            if let keyDown = CGEvent(keyboardEventSource: source, virtualKey: keyCode, keyDown: true) {
-                keyDown.flags = modifierFlags
-                keyDown.post(tap: .cghidEventTap)
-            }
-            
-            keyPressDelay()
-            
-            if let keyUp = CGEvent(keyboardEventSource: source, virtualKey: keyCode, keyDown: false) {
-                keyUp.flags = modifierFlags
-                keyUp.post(tap: .cghidEventTap)
-            }
+        if let keyCode = getKeyCode(key) {
+            postKeyCode(keyCode, flags: modifierFlags, source: source)
         }
         // For regular characters, use simple string input with modifiers
         else if let char = key.first {
@@ -320,11 +306,6 @@ enum ActionHelper {
                 event.post(tap: .cghidEventTap)
             }
         }
-        
-        // Read current flags state
-        if let checkEvent = CGEvent(keyboardEventSource: source, virtualKey: 0, keyDown: false) {
-            print("Current system flags state: \(checkEvent.flags)")
-        }
     }
     
     /// Types a Unicode character directly, handling characters beyond the BMP
@@ -357,23 +338,51 @@ enum ActionHelper {
         }
     }
     
-    /// Types a string of text with natural timing
+    /// Types a string of text, posting each run of plain characters as a single event
     /// - Parameter text: The text to type
     static func typeText(text: String) {
+        let source = CGEventSource(stateID: .hidSystemState)
+        var run: [UniChar] = []
+        run.reserveCapacity(maxUnicodeRunLength)
+        
         for char in text {
             switch char {
-            case "\n", "\r":  // Return/newline
-                keyPress(key: "return")
+            case "\n", "\r", "\r\n":  // Return/newline
+                postUnicodeRun(&run, source: source)
+                postKeyCode(returnKeyCode, source: source)
             case "\t":        // Tab
-                keyPress(key: "tab")
+                postUnicodeRun(&run, source: source)
+                postKeyCode(tabKeyCode, source: source)
             default:
-                // Use Unicode input for all other characters
-                unicodeKeyPress(char: char)
+                // Grow the run a whole character at a time so surrogate pairs are never split
+                let codeUnits = Array(char.utf16)
+                if run.count + codeUnits.count > maxUnicodeRunLength {
+                    postUnicodeRun(&run, source: source)
+                }
+                run.append(contentsOf: codeUnits)
             }
-            
-            // Random delay between characters (10-20ms)
-            usleep(UInt32.random(in: 10000...20000))
         }
+        postUnicodeRun(&run, source: source)
+    }
+    
+    /// Posts the pending UTF-16 run as one key down / key up pair and empties it
+    /// - Parameters:
+    ///   - run: The buffered UTF-16 code units; cleared after posting
+    ///   - source: The event source to post from
+    private static func postUnicodeRun(_ run: inout [UniChar], source: CGEventSource?) {
+        guard !run.isEmpty else { return }
+        defer { run.removeAll(keepingCapacity: true) }
+        
+        guard let event = CGEvent(keyboardEventSource: source, virtualKey: 0, keyDown: true) else { return }
+        event.keyboardSetUnicodeString(stringLength: run.count, unicodeString: run)
+        event.post(tap: .cghidEventTap)
+        
+        keyPressDelay()
+        
+        // The key up is the same event with its type flipped; it carries no string, as before
+        event.type = .keyUp
+        event.keyboardSetUnicodeString(stringLength: 0, unicodeString: [])
+        repost(event)
     }
     
     /// Gets the CGEventFlags for a list of modifier key names
@@ -382,7 +391,7 @@ enum ActionHelper {
     static func getModifierFlags(_ modifierNames: [String]) -> CGEventFlags {
         var flags = CGEventFlags()
         for name in modifierNames {
-            if let flag = modifierFlags[name.lowercased()] {
+            if let flag = modifierFlags[name] ?? modifierFlags[name.lowercased()] {
                 flags.insert(flag)
             }
         }
@@ -393,7 +402,39 @@ enum ActionHelper {
     /// - Parameter key: The name of the special key (e.g., "return", "tab")
     /// - Returns: The corresponding CGKeyCode, or nil if not found
     static func getKeyCode(_ key: String) -> CGKeyCode? {
-        return specialKeyMap[key.lowercased()]
+        // Names are usually passed in lowercase already, so only allocate a lowercased copy on a miss
+        return specialKeyMap[key] ?? specialKeyMap[key.lowercased()]
+    }
+
+    /// Posts a key down / key up pair for a virtual key code
+    /// - Parameters:
+    ///   - keyCode: The virtual key code to press
+    ///   - flags: Modifier flags to set on both events, or nil to keep the source's current flags
+    ///   - source: The event source to post from
+    private static func postKeyCode(_ keyCode: CGKeyCode, flags: CGEventFlags? = nil, source: CGEventSource?) {
+        guard let event = CGEvent(keyboardEventSource: source, virtualKey: keyCode, keyDown: true) else { return }
+        if let flags = flags {
+            event.flags = flags
+        }
+        event.post(tap: .cghidEventTap)
+        
+        keyPressDelay()
+        
+        // The key up is the same event with its type flipped
+        event.type = .keyUp
+        repost(event)
+    }
+
+    /// Posts an already created event again, refreshing its timestamp and optionally its location
+    /// - Parameters:
+    ///   - event: The event to post
+    ///   - location: New cursor location for mouse events, or nil to keep the current one
+    private static func repost(_ event: CGEvent, location: CGPoint? = nil) {
+        if let location = location {
+            event.location = location
+        }
+        event.timestamp = CGEventTimestamp(DispatchTime.now().uptimeNanoseconds)
+        event.post(tap: .cghidEventTap)
     }
 
     static func keyPressDelay() {
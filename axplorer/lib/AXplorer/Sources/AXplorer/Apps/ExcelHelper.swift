@@ -4,6 +4,38 @@ import Yams
 
 /// Helper functions for processing Excel-specific accessibility elements
 public class ExcelHelper {
+    /// Geometry and editing-state attributes that only add noise to the compact Excel state
+    static let keysToRemove: Set<String> = [
+        "AXFrame", "AXPosition", "AXSize", "AXRectInParentSpace", "AXVisibleCharacterRange", "AXSharedCharacterRange",
+        "AXSelectedTextRange", "AXNumberOfCharacters", "AXInsertionPointLineNumber", "AXFocused", "AXColumnIndexRange",
+        "AXRowIndexRange", "AXOrientation",
+    ]
+
+    /// Removes the noisy Excel attributes (keysToRemove) and flattens the elements, parsing and dumping the YAML once
+    /// - Parameter yamlString: YAML string containing Excel elements
+    /// - Returns: Processed YAML string with the attributes removed and the elements flattened, or empty string if processing fails
+    public static func filterAndFlattenElement(_ yamlString: String) -> String {
+        do {
+            guard let yamlObject = try Yams.load(yaml: yamlString) as? [String: Any],
+                  var yamlDict = filterKeys(in: yamlObject, keysToFilter: keysToRemove) as? [String: Any] else {
+                print("Failed to parse YAML into a dictionary")
+                return ""
+            }
+
+            // Flattens cell Elements
+            _flattenCell(&yamlDict)
+            
+            // Flattens the other types
+            _flattenElement(&yamlDict)
+            
+            // Convert back to YAML string
+            return (try? Yams.dump(object: yamlDict)) ?? ""
+        } catch {
+            print("Error processing YAML: \(error)")
+            return ""
+        }
+    }
+
     /// Flattens Excel  elements in a YAML hierarchy by removing certain attributes
     /// - Parameter yamlString: YAML string containing Excel cell elements
     /// - Returns: Processed YAML string with flattened elements cells, or empty string if processing fails
@@ -51,13 +83,27 @@ public class ExcelHelper {
         }
     }
     
+    /// Punctuation removed from cell descriptions
+    private static let punctuation = CharacterSet.punctuationCharacters
+
+    /// Removes punctuation in a single pass over the unicode scalars
+    /// - Parameter string: The string to clean
+    /// - Returns: The string without punctuation, or the original string when it has none
+    private static func _stripPunctuation(_ string: String) -> String {
+        // Most role descriptions ("cell") have no punctuation, so avoid building a new string for them
+        guard string.unicodeScalars.contains(where: punctuation.contains) else { return string }
+        var scalars = String.UnicodeScalarView()
+        scalars.append(contentsOf: string.unicodeScalars.lazy.filter { !punctuation.contains($0) })
+        return String(scalars)
+    }
+
     private static func _flattenCell(_ element: inout [String: Any], _ foundCell: Bool = false) {
         // If the element has attributes and matches the cell criteria, process it
         if var attributes = element["attributes"] as? [String: Any],
            (foundCell || (attributes[kAXRoleAttribute] as? String == "AXCell" &&
                           attributes[kAXRoleDescriptionAttribute] as? String == "cell")) {
-            // Check for children and iterate over them
-            if let children = element["children"] as? [String: [String: Any]] {
+            // Take the children out up front; flattened cells never keep them
+            if let children = element.removeValue(forKey: "children") as? [String: [String: Any]] {
                 for (_, var child) in children {
                     _flattenCell(&child, true) // Recursively process child elements
                     
@@ -76,9 +122,9 @@ public class ExcelHelper {
                             attributes[kAXValueAttribute] = axValue
                         }
                     }
-                    // Store the updated attributes back into `element["attributes"]`
-                    element["attributes"] = attributes
                 }
+                // Store the merged attributes back once, not once per child
+                element["attributes"] = attributes
             }
 
             if !foundCell { // top level only
@@ -87,17 +133,10 @@ public class ExcelHelper {
                 let axDescription = attributes[kAXDescriptionAttribute] as? String ?? ""
                 
                 // Remove punctuation from `Description`
-                let descriptionText = [axDescription]
-                    .filter { !$0.isEmpty }
-                    .joined(separator: " ") // Ensures space only if both values exist
-                    .components(separatedBy: CharacterSet.punctuationCharacters) // Remove punctuation
-                    .joined() // Rejoin without punctuation
+                let descriptionText = _stripPunctuation(axDescription)
                     .trimmingCharacters(in: .whitespaces) // Removes leading/trailing spaces
-                    // Construct attributes dynamically
 
-                let cleaned_roleDescription = roleDescription
-                    .components(separatedBy: CharacterSet.punctuationCharacters)
-                    .joined()
+                let cleaned_roleDescription = _stripPunctuation(roleDescription)
                 
                 // Only add "AXValue" if it exists
                 if let axValue = attributes["AXValue"] {
@@ -109,8 +148,6 @@ public class ExcelHelper {
                 element.removeValue(forKey: kAXRoleDescriptionAttribute)
                 element.removeValue(forKey: "attributes")
             }
-            // Remove children
-            element.removeValue(forKey: "children")
         } else {
             // If the current element is not a cell, recursively process all dictionaries or arrays
             for (key, value) in element {
@@ -73,6 +73,28 @@ public func destroyAccessExplorer(context: UnsafeMutableRawPointer?) {
     Unmanaged<AccessExplorer>.fromOpaque(context).release()
 }
 
+/// Installs an accessibility observer that reports UI changes of the explorer's application.
+/// - Parameters:
+///   - context: The explorer context pointer obtained from createAccessExplorer
+///   - callback: Optional C callback invoked on a background thread for every notification
+/// - Returns: true if the observer was installed, false otherwise
+/// - Note: The callback must stay valid until removeObserver or destroyAccessExplorer is called
+@_cdecl("installObserver")
+public func installObserver(context: UnsafeMutableRawPointer?, callback: ChangeCallback?) -> Bool {
+    guard let context = context else { return false }
+    let explorer = Unmanaged<AccessExplorer>.fromOpaque(context).takeUnretainedValue()
+    return explorer.installObserver(callback: callback)
+}
+
+/// Removes the accessibility observer installed by installObserver.
+/// - Parameter context: The explorer context pointer obtained from createAccessExplorer
+@_cdecl("removeObserver")
+public func removeObserver(context: UnsafeMutableRawPointer?) {
+    guard let context = context else { return }
+    let explorer = Unmanaged<AccessExplorer>.fromOpaque(context).takeUnretainedValue()
+    explorer.removeObserver()
+}
+
 // MARK: - YAML Generation
 
 /// Retrieves the YAML representation of the application's accessibility hierarchy.
@@ -103,6 +125,29 @@ public func getMainWindowYAML(context: UnsafeMutableRawPointer?, maxDepth: Int)
     return UnsafePointer(strdup(yaml))
 }
 
+/// Writes the YAML representation of the application's main window hierarchy to a file.
+/// - Parameters:
+///   - context: The explorer context pointer obtained from createAccessExplorer
+///   - path: A C string containing the path of the file to write
+///   - maxDepth: Maximum depth to traverse in the accessibility hierarchy
+/// - Returns: true if the file was written successfully, false otherwise
+@_cdecl("dumpMainWindowYAML")
+public func dumpMainWindowYAML(context: UnsafeMutableRawPointer?, path: UnsafePointer<CChar>, maxDepth: Int) -> Bool {
+    guard let context = context else { return false }
+    let explorer = Unmanaged<AccessExplorer>.fromOpaque(context).takeUnretainedValue()
+    return explorer.dumpMainWindowYAML(to: String(cString: path), maxDepth: maxDepth)
+}
+
+/// Computes a cheap fingerprint of the application's main window state without walking the hierarchy.
+/// - Parameter context: The explorer context pointer obtained from createAccessExplorer
+/// - Returns: A non-zero fingerprint, or 0 if the main window could not be retrieved
+@_cdecl("getMainWindowFingerprint")
+public func getMainWindowFingerprint(context: UnsafeMutableRawPointer?) -> UInt64 {
+    guard let context = context else { return 0 }
+    let explorer = Unmanaged<AccessExplorer>.fromOpaque(context).takeUnretainedValue()
+    return explorer.getMainWindowFingerprint() ?? 0
+}
+
 /// Retrieves the YAML representation of the application's focused window hierarchy.
 /// - Parameters:
 ///   - context: The explorer context pointer obtained from createAccessExplorer
@@ -204,6 +249,43 @@ public func performAction(
     return explorer.performAction(context: elementContext, elementId: elementId, action: actionString)
 }
 
+/// Performs a batch of accessibility actions, passed as parallel arrays, in a single call.
+/// - Parameters:
+///   - context: The explorer context pointer obtained from createAccessExplorer
+///   - contextTypes: C strings specifying the context type of each action
+///   - elementIds: The identifiers of the elements to perform the actions on
+///   - actions: C strings specifying the actions to perform
+///   - results: Receives whether each action was performed successfully
+///   - count: Number of actions in each array
+/// - Returns: The number of actions performed successfully
+@_cdecl("performActions")
+public func performActions(
+    context: UnsafeMutableRawPointer?,
+    contextTypes: UnsafePointer<UnsafePointer<CChar>>,
+    elementIds: UnsafePointer<Int>,
+    actions: UnsafePointer<UnsafePointer<CChar>>,
+    results: UnsafeMutablePointer<Bool>,
+    count: Int
+) -> Int {
+    results.initialize(repeating: false, count: count)
+    guard let context = context else { return 0 }
+    let explorer = Unmanaged<AccessExplorer>.fromOpaque(context).takeUnretainedValue()
+    var succeeded = 0
+    for i in 0..<count {
+        let contextString = String(cString: contextTypes[i])
+        guard let elementContext = ElementContext(rawValue: contextString) else {
+            print("Error: Invalid context type '\(contextString)'.")
+            continue
+        }
+        let actionString = String(cString: actions[i])
+        if explorer.performAction(context: elementContext, elementId: elementIds[i], action: actionString) {
+            results[i] = true
+            succeeded += 1
+        }
+    }
+    return succeeded
+}
+
 /// Sets the value of an accessibility attribute for a specific element.
 /// - Parameters:
 ///   - context: The explorer context pointer obtained from createAccessExplorer
@@ -281,15 +363,13 @@ public func moveToElement(
 // MARK: - Mouse Actions
 
 /// Gets the current mouse cursor position
-/// - Parameters:
-///   - x: Pointer to store the x coordinate
-///   - y: Pointer to store the y coordinate
+/// - Parameter point: Pointer to two doubles that receive the x and y coordinates
 /// - Returns: true if coordinates were retrieved successfully, false otherwise
 @_cdecl("getMouseLocation")
-public func getMouseLocation(x: UnsafeMutablePointer<Double>, y: UnsafeMutablePointer<Double>) -> Bool {
+public func getMouseLocation(point: UnsafeMutablePointer<Double>) -> Bool {
     guard let location = ActionHelper.getMouseLocation() else { return false }
-    x.pointee = Double(location.x)
-    y.pointee = Double(location.y)
+    point[0] = Double(location.x)
+    point[1] = Double(location.y)
     return true
 }
 
@@ -481,3 +561,18 @@ public func flattenExcelCells(yamlCString: UnsafePointer<CChar>) -> UnsafePointe
     }
     return UnsafePointer(strdup(result))
 }
+
+/// Removes the noisy Excel attributes and flattens the Excel elements of a YAML hierarchy in one call.
+/// The attributes to remove are fixed (ExcelHelper.keysToRemove) and the YAML is parsed and dumped only once.
+/// - Parameter yamlCString: A C string containing the YAML to process
+/// - Returns: A C string containing the compact YAML, or nil if failed
+/// - Note: The returned string must be freed by the caller
+@_cdecl("flattenExcelCellsFast")
+public func flattenExcelCellsFast(yamlCString: UnsafePointer<CChar>) -> UnsafePointer<CChar>? {
+    let yamlString = String(cString: yamlCString)
+    let result = ExcelHelper.filterAndFlattenElement(yamlString)
+    if result.isEmpty {
+        return nil
+    }
+    return UnsafePointer(strdup(result))
+}
@@ -19,11 +19,14 @@ public class AccessExplorer {
     /// The root accessibility element of the application.
     private var appElement: AXUIElement
     
-    /// A dictionary storing UI elements grouped by context.
-    private var elementAccessStore: [String: [Int: AXUIElement]] = [:]
+    /// A dictionary storing UI elements grouped by context, keyed by the enum itself so lookups do not hash strings.
+    private var elementAccessStore: [ElementContext: [Int: AXUIElement]] = [:]
     
     /// The current index for element storage. Reserved indices are below 100.
     private var currentIndex: Int = 100
+
+    /// Observer reporting UI changes of the application, if installed.
+    private var changeObserver: ChangeObserver?
     
     /**
      Initializes the AccessExplorer with the given application name.
@@ -40,6 +43,35 @@ public class AccessExplorer {
         self.appElement = appElement
     }
 
+    deinit {
+        changeObserver?.stop()
+    }
+
+    /**
+     Installs an accessibility observer that reports changes to the application's UI.
+
+     Value, focus, creation and destruction notifications are observed on a background run loop.
+     Any previously installed observer is replaced.
+
+     - Parameter callback: Optional C callback invoked on the observer thread for every notification.
+     - Returns: `true` if the observer was installed; otherwise, `false`.
+     */
+    public func installObserver(callback: ChangeCallback?) -> Bool {
+        removeObserver()
+        changeObserver = ChangeObserver(appElement: appElement, callback: callback)
+        return changeObserver != nil
+    }
+
+    /**
+     Removes the accessibility observer installed by `installObserver`, if any.
+
+     Once this returns the callback will not be invoked again.
+     */
+    public func removeObserver() {
+        changeObserver?.stop()
+        changeObserver = nil
+    }
+
     /**
      Retrieves a YAML representation of the application's the application top level window hierarchy.
      
@@ -79,6 +111,64 @@ public class AccessExplorer {
         return yamlWindowOut
     }
 
+    /**
+     Writes the YAML representation of the application's main window hierarchy to a file.
+
+     Behaves like `getMainWindowYAML`, including refreshing the stored `elementMap`, but the YAML is
+     written straight to disk so it never has to be copied across the C boundary.
+
+     - Parameters:
+       - path: The file to write.
+       - maxDepth: Maximum depth to traverse.
+     - Returns: `true` if the file was written; otherwise, `false`.
+     */
+    public func dumpMainWindowYAML(to path: String, maxDepth: Int = 5) -> Bool {
+        guard let yaml = getMainWindowYAML(maxDepth: maxDepth), !yaml.isEmpty else {
+            return false
+        }
+
+        do {
+            try yaml.write(toFile: path, atomically: false, encoding: .utf8)
+            return true
+        } catch {
+            print("Error: Unable to write YAML to '\(path)': \(error)")
+            return false
+        }
+    }
+
+    /**
+     Computes a cheap fingerprint of the application's main window state.
+
+     Only the window title, frame and direct child count, plus the identity, role and value of the
+     focused UI element are hashed, so no hierarchy walk is performed. Callers can poll this to decide
+     whether a full `getMainWindowYAML` traversal is needed.
+
+     - Returns: A non-zero fingerprint, or `nil` if the main window cannot be retrieved.
+     */
+    public func getMainWindowFingerprint() -> UInt64? {
+        guard let mainWindow = getMainWindow(for: appElement) else {
+            return nil
+        }
+
+        var hasher = Hasher()
+        hashAttributes(of: mainWindow, [kAXTitleAttribute, kAXPositionAttribute, kAXSizeAttribute], into: &hasher)
+
+        var childCount: CFIndex = 0
+        AXUIElementGetAttributeValueCount(mainWindow, kAXChildrenAttribute as CFString, &childCount)
+        hasher.combine(childCount)
+
+        var focused: CFTypeRef?
+        if AXUIElementCopyAttributeValue(appElement, kAXFocusedUIElementAttribute as CFString, &focused) == .success,
+           let focused = focused, CFGetTypeID(focused) == AXUIElementGetTypeID() {
+            let focusedElement = focused as! AXUIElement
+            hasher.combine(CFHash(focusedElement))
+            hashAttributes(of: focusedElement, [kAXRoleAttribute, kAXTitleAttribute, kAXValueAttribute], into: &hasher)
+        }
+
+        let fingerprint = UInt64(bitPattern: Int64(hasher.finalize()))
+        return fingerprint == 0 ? 1 : fingerprint
+    }
+
     /**
      Retrieves a YAML representation of the application's focused window hierarchy.
      
@@ -254,7 +344,7 @@ public class AccessExplorer {
        - elementMap: A dictionary of element indices and their corresponding accessibility elements.
      */
     private func storeElement(context: ElementContext, elementMap: [Int: AXUIElement]) {
-        elementAccessStore[context.rawValue] = elementMap
+        elementAccessStore[context] = elementMap
     }
     
     /**
@@ -268,7 +358,7 @@ public class AccessExplorer {
      - Returns: The accessibility element if found; otherwise, `nil`.
      */
     public func getElement(context: ElementContext, index: Int) -> AXUIElement? {
-        return elementAccessStore[context.rawValue]?[index]
+        return elementAccessStore[context]?[index]
     }
     
     /**
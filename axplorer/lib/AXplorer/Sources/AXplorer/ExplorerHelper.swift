@@ -307,6 +307,45 @@ func convertHierarchyToYAML(_ rootElement: AXUIElement, maxDepth: Int = 5) -> (y
     }
 }
 
+/// Feeds the values of the given attributes into a hasher without building any intermediate dictionaries.
+/// - Parameters:
+///   - element: The element whose attributes are hashed.
+///   - attributes: The attribute names to read.
+///   - hasher: The hasher to combine the values into.
+func hashAttributes(of element: AXUIElement, _ attributes: [String], into hasher: inout Hasher) {
+    for attribute in attributes {
+        var value: CFTypeRef?
+        guard AXUIElementCopyAttributeValue(element, attribute as CFString, &value) == .success,
+              let value = value else {
+            hasher.combine(0)
+            continue
+        }
+
+        if CFGetTypeID(value) == AXValueGetTypeID() {
+            let axValue = value as! AXValue
+            switch AXValueGetType(axValue) {
+            case .cgPoint:
+                var point = CGPoint.zero
+                if AXValueGetValue(axValue, .cgPoint, &point) {
+                    hasher.combine(point.x)
+                    hasher.combine(point.y)
+                }
+            case .cgSize:
+                var size = CGSize.zero
+                if AXValueGetValue(axValue, .cgSize, &size) {
+                    hasher.combine(size.width)
+                    hasher.combine(size.height)
+                }
+            default:
+                hasher.combine(CFHash(axValue))
+            }
+        } else {
+            // CFString, CFNumber and CFBoolean hash by content
+            hasher.combine(CFHash(value))
+        }
+    }
+}
+
 // Function to get and print all window names using kAXWindowsAttribute
 func getAllWindows(for appElement: AXUIElement) {
     var appWindows: CFTypeRef?
@@ -596,7 +635,7 @@ private func filterNodes(in object: Any, key: String, value: Any?) -> Any {
     return object
 }
 
-private func filterKeys(in object: Any, keysToFilter: Set<String>) -> Any {
+func filterKeys(in object: Any, keysToFilter: Set<String>) -> Any {
     if let dictionary = object as? [String: Any] {
         var filteredDict = [String: Any]()
         
@@ -0,0 +1,114 @@
+//
+//  Observer.swift
+//  AXplorer
+//
+
+import Cocoa
+import ApplicationServices
+import Foundation
+
+/// C-compatible callback invoked whenever the observed application's UI changes.
+public typealias ChangeCallback = @convention(c) () -> Void
+
+/// Bridges AXObserver notifications back to the owning `ChangeObserver`.
+private func changeObserverCallback(
+    _ observer: AXObserver,
+    _ element: AXUIElement,
+    _ notification: CFString,
+    _ refcon: UnsafeMutableRawPointer?
+) {
+    guard let refcon = refcon else { return }
+    Unmanaged<ChangeObserver>.fromOpaque(refcon).takeUnretainedValue().notify()
+}
+
+/// Watches an application for accessibility notifications that indicate its UI changed.
+///
+/// Notifications are delivered on a dedicated thread running its own run loop, so the observer
+/// works even when the host process (e.g. a Python interpreter) never runs the main run loop.
+final class ChangeObserver: @unchecked Sendable {
+    /// Notifications registered on the application element.
+    static let notifications: [String] = [
+        kAXValueChangedNotification,
+        kAXFocusedUIElementChangedNotification,
+        kAXCreatedNotification,
+        kAXUIElementDestroyedNotification
+    ]
+
+    private let observer: AXObserver
+    private let appElement: AXUIElement
+    private let lock = NSLock()
+    private var callback: ChangeCallback?
+    private var runLoop: CFRunLoop?
+
+    /**
+     Creates an observer for the application owning `appElement` and starts listening.
+
+     - Parameters:
+       - appElement: The application element to observe.
+       - callback: Optional C callback invoked on every notification.
+     - Returns: `nil` if the observer could not be created.
+     */
+    init?(appElement: AXUIElement, callback: ChangeCallback?) {
+        var pid: pid_t = 0
+        guard AXUIElementGetPid(appElement, &pid) == .success else {
+            print("Error: Unable to get the application pid for the observer.")
+            return nil
+        }
+
+        var created: AXObserver?
+        guard AXObserverCreate(pid, changeObserverCallback, &created) == .success, let observer = created else {
+            print("Error: Unable to create accessibility observer.")
+            return nil
+        }
+
+        self.observer = observer
+        self.appElement = appElement
+        self.callback = callback
+
+        let refcon = Unmanaged.passUnretained(self).toOpaque()
+        for notification in ChangeObserver.notifications {
+            AXObserverAddNotification(observer, appElement, notification as CFString, refcon)
+        }
+
+        let ready = DispatchSemaphore(value: 0)
+        let thread = Thread { [self] in
+            let current = CFRunLoopGetCurrent()
+            CFRunLoopAddSource(current, AXObserverGetRunLoopSource(self.observer), .defaultMode)
+            self.lock.lock()
+            self.runLoop = current
+            self.lock.unlock()
+            ready.signal()
+            CFRunLoopRun()
+        }
+        thread.name = "AXplorer.ChangeObserver"
+        thread.start()
+        ready.wait()
+    }
+
+    /// Called from the observer run loop for every delivered notification.
+    fileprivate func notify() {
+        // The callback runs under the lock so `stop` cannot return while it is in flight
+        lock.lock()
+        defer { lock.unlock() }
+        callback?()
+    }
+
+    /// Unregisters the notifications and stops the observer thread.
+    func stop() {
+        for notification in ChangeObserver.notifications {
+            AXObserverRemoveNotification(observer, appElement, notification as CFString)
+        }
+
+        lock.lock()
+        callback = nil
+        let current = runLoop
+        runLoop = nil
+        lock.unlock()
+
+        if let current = current {
+            // Removing the only source also ends a run loop that has not started running yet
+            CFRunLoopRemoveSource(current, AXObserverGetRunLoopSource(observer), .defaultMode)
+            CFRunLoopStop(current)
+        }
+    }
+}
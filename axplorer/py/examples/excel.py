@@ -17,9 +17,12 @@ from axplorer import (
     launch_application,
     raise_application,
 )
-from axplorer.common.yaml import filter_yaml, filter_yaml_nodes
+from axplorer.common.yaml import compile_key_pattern, filter_yaml, filter_yaml_nodes, filter_yaml_str
 from axplorer.macos.action import double_left_click, drag_to_element, left_click, move_to_element, press_key_combo, right_click, scroll_down, scroll_up, type_text
 from axplorer.macos.apps.excel_helper import flatten_excel_cells, get_compact_excel_yaml
+from examples.utils.wait import wait_until_ready
+from examples.utils.window_cache import MainWindowCache
+from examples.utils.yaml_helper import load_tree
 
 # UI Element IDs for iMovie interface
 FONT_COMBO_BUTTON_ID = 36
@@ -28,6 +31,14 @@ TRAILER_BUTTON_ID = 37
 FONT_BUTTON_ID = 246
 CELL_ID = 720
 
+# Position-related attributes stripped from debug dumps
+KEYS_TO_REMOVE = frozenset({
+    "AXFrame", "AXPosition", "AXSize", "AXRectInParentSpace", "AXVisibleCharacterRange", "AXSharedCharacterRange",
+    "AXSelectedTextRange", "AXNumberOfCharacters", "AXInsertionPointLineNumber", "AXFocused", "AXColumnIndexRange",
+    "AXRowIndexRange", "AXOrientation", "AXModal", "AXActivationPoint",
+})
+KEYS_TO_REMOVE_PATTERN = compile_key_pattern(KEYS_TO_REMOVE)
+
 
 def do_excel_demo() -> None:
     prompt_accessibility_permissions()
@@ -35,25 +46,22 @@ def do_excel_demo() -> None:
     # Launch and focus iMovie
     if not raise_application("Microsoft Excel"):
         print("Launching iMovie...")
+        # launch_application blocks until the app has finished launching
         launch_application("Microsoft Excel")
-        time.sleep(2)  # Wait for launch
         raise_application("Microsoft Excel")
 
-    time.sleep(2)  # Wait for window to be ready
-
     # Create explorer instance
     try:
         with AccessibilityExplorer("Microsoft Excel") as explorer:
-            # Get YAML for the main window
-            yaml = explorer.get_main_window_yaml(50)
-            if yaml:
+            if not wait_until_ready(explorer):
+                print("Timed out waiting for the window to settle")
+            window_cache = MainWindowCache(explorer)
+            # Dump YAML for the main window
+            if window_cache.dump("output.yaml", 50):
+                # Refresh the JSON sidecar so later inspection loads skip YAML parsing
+                load_tree("output.yaml")
                 # Remove position-related attributes
-                keys_to_remove = ["AXFrame", "AXPosition", "AXSize", "AXRectInParentSpace", "AXVisibleCharacterRange", "AXSharedCharacterRange", 
-                                  "AXSelectedTextRange", "AXNumberOfCharacters", "AXInsertionPointLineNumber", "AXFocused", "AXColumnIndexRange",
-                                  "AXRowIndexRange", "AXOrientation", "AXModal", "AXActivationPoint"]
-                #yaml = filter_yaml(yaml, keys_to_remove)
-                with open("output.yaml", "w") as file:
-                    file.write(yaml)
+                #yaml = filter_yaml_str(yaml, KEYS_TO_REMOVE_PATTERN)
                 yaml = get_compact_excel_yaml(explorer)
                 #yaml = filter_yaml_nodes(yaml, "AXRole", "AXCell")
                 try:
@@ -77,7 +85,7 @@ def do_excel_demo() -> None:
             left_click()
 
 
-            explorer.get_main_window_yaml(50)
+            window_cache.get_yaml(50)
 
             explorer.perform_action(
                 context_type="Main",
@@ -102,19 +110,10 @@ def do_excel_demo() -> None:
 
             type_text("... And SHIFT tab to go left... now watch me drag\n")
 
-            yaml = explorer.get_main_window_yaml(50)
-            if yaml:
-                # Remove position-related attributes
-                # keys_to_remove = ["AXFrame", "AXPosition", "AXSize", "AXRectInParentSpace"]
-                # yaml = filter_yaml(yaml, keys_to_remove)
-                try:
-                    with open("output.yaml", "w") as file:
-                        file.write(yaml)
-                    print("Saved UI hierarchy to output.yaml")
-                except IOError as e:
-                    print(f"Failed to save YAML: {e}")
+            if window_cache.dump("output.yaml", 50):
+                print("Saved UI hierarchy to output.yaml")
             else:
-                print("Failed to get window hierarchy")
+                print("Failed to save window hierarchy")
 
             time.sleep(2)
 
@@ -4,14 +4,11 @@ Excel LLM Chatbot that uses AXplorer to control Excel based on natural language
 Uses a state-based architecture for better control and validation.
 """
 
+import asyncio
 import sys
-import time
-import json
-import yaml
 import argparse
-from typing import List, Optional, Dict, Any, Tuple
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Tuple
 from pathlib import Path
-from openai import OpenAI
 
 from axplorer import (
     AccessibilityExplorer,
@@ -20,10 +17,16 @@ from axplorer import (
     raise_application,
 )
 
+from axplorer.macos.apps.excel_helper import get_compact_excel_yaml
+
 from examples.models import Goal, Step, StepStatus
 from examples.states import GoalExecutor
 from examples.states.goal_state_machine import ConfirmChoice, GoalStateMachine, GoalState, GoalEvent, GoalStateResult, ReviewChoice
 from examples.ui import AutomationUI
+from examples.utils.wait import wait_until_ready
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
 
 class ExcelLLMController:
     """Main controller for Excel LLM automation."""
@@ -34,11 +37,31 @@ class ExcelLLMController:
     CONFIRM_REJECTION_PROMPT = "Are you sure you want to start over? (y/n):"
     NEW_REQUEST_PROMPT = "Enter your request or 'quit' to exit:"
     INVALID_CHOICE_PROMPT = "Invalid choice. Please try again."
+
+    # User input to choice maps
+    REVIEW_CHOICES = {
+        'y': ReviewChoice.ACCEPT,
+        'm': ReviewChoice.MODIFY,
+        'n': ReviewChoice.REJECT
+    }
+    CONFIRM_CHOICES = {
+        'y': ConfirmChoice.YES,
+        'n': ConfirmChoice.NO
+    }
     
-    def __init__(self, openai_client: OpenAI, debug: bool = True):
+    def __init__(self, openai_client: "OpenAI", async_openai_client: "AsyncOpenAI", debug: bool = True,
+                 plan_cache_enabled: bool = False, validation_batch_size: int = 1,
+                 batch_mode: bool = False, preplan: bool = False):
         self.client = openai_client
+        self.async_client = async_openai_client  # Used by the goal executor
+        # Long-lived loop, so the async client's pooled connections survive across goal runs
+        self._loop = asyncio.new_event_loop()
         self.llm_model = 'gpt-4o'
         self.debug = debug
+        self.plan_cache_enabled = plan_cache_enabled
+        self.validation_batch_size = validation_batch_size
+        self.batch_mode = batch_mode
+        self.preplan = preplan
         self.explorer: Optional[AccessibilityExplorer] = None
         
         # Create debug directory by default
@@ -46,9 +69,24 @@ class ExcelLLMController:
 
         self.launch_excel() 
         self.explorer = AccessibilityExplorer("Microsoft Excel")
+        wait_until_ready(self.explorer)
+
+        # Only rewalk the Excel window after the accessibility observer reports a change or a step
+        # executor acts on the UI. Not every change is observed (scrolls, selection, window moves)
+        # and notifications arrive asynchronously, so the observer only skips walks between calls
+        # that change nothing.
+        self._tree_dirty = True
+        self._cached_excel_state: Optional[str] = None
+        self._observer_installed = self.explorer.install_observer(self._mark_tree_dirty)
+
         # Initialize components
         self.ui = AutomationUI()
-        self.goal_state_machine = GoalStateMachine(openai_client=openai_client, llm_model=self.llm_model, explorer=self.explorer)
+        self.goal_state_machine = GoalStateMachine(
+            openai_client=openai_client,
+            llm_model=self.llm_model,
+            explorer=self.explorer,
+            excel_state_provider=self.get_excel_state
+        )
         self.goal_executor = None  # Initialized when goals are accepted
         self.step_executor = None
         
@@ -63,40 +101,47 @@ class ExcelLLMController:
         
         if not raise_application("Microsoft Excel"):
             self.ui.log_message("Launching Excel...", "info")
+            # launch_application blocks until Excel has finished launching
             launch_application("Microsoft Excel")
-            time.sleep(2)
             raise_application("Microsoft Excel")
-        
-        time.sleep(2)  # Wait for window to be ready
     
     def instantiate_goal_executor(self, goals : list[Goal]) -> None:
         """Initialize goal executor."""
         self.goal_executor = GoalExecutor(
-            self.client,
+            self.async_client,
             llm_model=self.llm_model,
             goals=goals,
             explorer=self.explorer,
             on_goal_update=self._handle_goal_update,
             on_steps_update=self._handle_steps_update,
-            on_step_failure=self._handle_step_failure
+            on_step_failure=self._handle_step_failure,
+            excel_state_provider=self.get_excel_state,
+            on_state_invalidated=self._mark_tree_dirty,
+            plan_cache_enabled=self.plan_cache_enabled,
+            validation_batch_size=self.validation_batch_size,
+            batch_mode=self.batch_mode,
+            preplan=self.preplan
         )
 
+    def _mark_tree_dirty(self) -> None:
+        """Observer callback, runs on a native thread whenever the Excel UI changes, and called when a step acts."""
+        self._tree_dirty = True
+
+    def get_excel_state(self) -> Optional[str]:
+        """Get the compact Excel state, rewalking the window only when it changed."""
+        if self._tree_dirty or self._cached_excel_state is None or not self._observer_installed:
+            # Clear the flag first so a change during the walk triggers another one
+            self._tree_dirty = False
+            self._cached_excel_state = get_compact_excel_yaml(self.explorer)
+        return self._cached_excel_state
+
     def _map_review_input(self, text: str) -> Optional[ReviewChoice]:
         """Map user input to ReviewChoice enum."""
-        mapping = {
-            'y': ReviewChoice.ACCEPT,
-            'm': ReviewChoice.MODIFY,
-            'n': ReviewChoice.REJECT
-        }
-        return mapping.get(text.lower())
+        return self.REVIEW_CHOICES.get(text.lower())
     
     def _map_confirm_input(self, text: str) -> Optional[ConfirmChoice]:
         """Map user input to ConfirmChoice enum."""
-        mapping = {
-            'y': ConfirmChoice.YES,
-            'n': ConfirmChoice.NO
-        }
-        return mapping.get(text.lower())
+        return self.CONFIRM_CHOICES.get(text.lower())
     
     def _handle_user_input(self, text: str) -> None:
         """Handle user input from the UI."""
@@ -128,7 +173,7 @@ class ExcelLLMController:
 
                     self.instantiate_goal_executor(self.goal_state_machine.get_goals())  # Initialize goal_executor
                     # Execute goals and handle result
-                    if self.goal_executor.execute_goals():
+                    if self._loop.run_until_complete(self.goal_executor.execute_goals()):
                         # Goals completed successfully
                         self.ui.log_message("All goals completed successfully!", "success")
                         self.ui.log_message(self.NEW_REQUEST_PROMPT)
@@ -242,16 +287,33 @@ class ExcelLLMController:
         """Clean up resources."""
         if self.explorer:
             self.explorer.cleanup()
+        if not self._loop.is_closed():
+            self._loop.run_until_complete(self.async_client.close())
+            self._loop.close()
         self.ui.cleanup()
 
 def main():
     parser = argparse.ArgumentParser(description="Excel LLM Controller")
     parser.add_argument("--api-key", help="OpenAI API key", default="")
+    parser.add_argument("--plan-cache", action="store_true",
+                        help="Reuse the steps of similar completed goals when planning")
+    parser.add_argument("--validation-batch", type=int, default=1, metavar="N",
+                        help="Validate executed steps N at a time in one request")
+    parser.add_argument("--batch", action="store_true",
+                        help="Plan accepted goals through the Batch API (cheaper, but can take hours)")
+    parser.add_argument("--preplan", action="store_true",
+                        help="Plan the next independent goal while the current one runs")
     args = parser.parse_args()
     
     try:
+        # Imported here so --help and module imports do not pay for loading the OpenAI SDK
+        from openai import AsyncOpenAI, OpenAI
+
         client = OpenAI(api_key=args.api_key)
-        controller = ExcelLLMController(client)
+        async_client = AsyncOpenAI(api_key=args.api_key)
+        controller = ExcelLLMController(client, async_client, plan_cache_enabled=args.plan_cache,
+                                         validation_batch_size=args.validation_batch,
+                                         batch_mode=args.batch, preplan=args.preplan)
         controller.run()
     except Exception as e:
         print(f"\nError: {e}")
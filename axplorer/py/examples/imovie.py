@@ -20,6 +20,8 @@ from axplorer import (
 )
 from axplorer.common.yaml import filter_yaml
 from axplorer.macos.action import left_click, move_to_element, scroll_down, scroll_up
+from examples.utils.wait import wait_until_ready
+from examples.utils.window_cache import MainWindowCache
 
 # UI Element IDs for iMovie interface
 FIRST_BUTTON_ID = 24
@@ -43,29 +45,21 @@ def do_imovie_demo() -> None:
     # Launch and focus iMovie
     if not raise_application("iMovie"):
         print("Launching iMovie...")
+        # launch_application blocks until the app has finished launching
         launch_application("iMovie")
-        time.sleep(2)  # Wait for launch
         raise_application("iMovie")
-
-    time.sleep(2)  # Wait for window to be ready
     
     # Create explorer instance
     try:
         with AccessibilityExplorer("iMovie") as explorer:
+            if not wait_until_ready(explorer):
+                print("Timed out waiting for the window to settle")
+            window_cache = MainWindowCache(explorer)
             # Get YAML for the main window
-            yaml = explorer.get_main_window_yaml(50)
-            if yaml:
-                # Remove position-related attributes
-                # keys_to_remove = ["AXFrame", "AXPosition", "AXSize", "AXRectInParentSpace"]
-                # yaml = filter_yaml(yaml, keys_to_remove)
-                try:
-                    with open("output.yaml", "w") as file:
-                        file.write(yaml)
-                    print("Saved UI hierarchy to output.yaml")
-                except IOError as e:
-                    print(f"Failed to save YAML: {e}")
+            if window_cache.dump("output.yaml", 50):
+                print("Saved UI hierarchy to output.yaml")
             else:
-                print("Failed to get window hierarchy")
+                print("Failed to save window hierarchy")
             
             time.sleep(2)  # Wait for iMovie to fully focus
 
@@ -87,7 +81,7 @@ def do_imovie_demo() -> None:
 
             time.sleep(2)
 
-            explorer.get_main_window_yaml(50)
+            window_cache.get_yaml(50)
 
             move_to_element(explorer=explorer, context_type="Main", element_id=TRAILER_BUTTON_ID)
 
@@ -97,7 +91,7 @@ def do_imovie_demo() -> None:
 
             time.sleep(2)
 
-            explorer.get_main_window_yaml(50)
+            window_cache.get_yaml(50)
 
             move_to_element(explorer=explorer, context_type="Main", element_id=FINAL_BUTTON_ID)
             
@@ -111,19 +105,10 @@ def do_imovie_demo() -> None:
 
             time.sleep(1)
 
-            yaml = explorer.get_main_window_yaml(50)
-            if yaml:
-                # Remove position-related attributes
-                # keys_to_remove = ["AXFrame", "AXPosition", "AXSize", "AXRectInParentSpace"]
-                # yaml = filter_yaml(yaml, keys_to_remove)
-                try:
-                    with open("output.yaml", "w") as file:
-                        file.write(yaml)
-                    print("Saved UI hierarchy to output.yaml")
-                except IOError as e:
-                    print(f"Failed to save YAML: {e}")
+            if window_cache.dump("output.yaml", 50):
+                print("Saved UI hierarchy to output.yaml")
             else:
-                print("Failed to get window hierarchy")
+                print("Failed to save window hierarchy")
 
             move_to_element(explorer=explorer, context_type="Main", element_id=4)
 
@@ -2,6 +2,6 @@
 Models package for Excel LLM automation.
 """
 
-from .goal import Goal, Step, GoalStatus, StepStatus
+from .goal import Goal, Step, GoalStatus, StepStatus, StepsSummary
 
-__all__ = ['Goal', 'Step', 'GoalStatus', 'StepStatus']
+__all__ = ['Goal', 'Step', 'GoalStatus', 'StepStatus', 'StepsSummary']
@@ -2,11 +2,22 @@
 Goal and Step models for Excel LLM automation.
 """
 
+import time
+import weakref
 from enum import Enum
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, NamedTuple, Optional, Any
 from dataclasses import dataclass, field
 from datetime import datetime
 
+# Offset from the monotonic clock to the epoch, used to turn monotonic timestamps back into wall clock time
+_EPOCH_NS = time.time_ns() - time.monotonic_ns()
+
+def _isoformat(timestamp_ns: Optional[int]) -> Optional[str]:
+    """Format a time.monotonic_ns() timestamp as an ISO 8601 local time string."""
+    if timestamp_ns is None:
+        return None
+    return datetime.fromtimestamp((_EPOCH_NS + timestamp_ns) / 1e9).isoformat()
+
 class GoalStatus(Enum):
     """Status states for a goal."""
     PENDING = "pending"
@@ -23,7 +34,18 @@ class StepStatus(Enum):
     FAILED = "failed"
     VALIDATION_FAILED = "validation_failed"
 
-@dataclass
+# Enum members are singletons, so status checks compare by identity or frozenset membership
+FAILED_STEP_STATUSES = frozenset({StepStatus.FAILED, StepStatus.VALIDATION_FAILED})
+FINISHED_STEP_STATUSES = FAILED_STEP_STATUSES | {StepStatus.COMPLETED}
+
+class StepsSummary(NamedTuple):
+    """Step counts of a goal, gathered in a single pass over its steps."""
+    completed: int
+    failed: int
+    pending_index: int  # Index of the first pending step, -1 if there is none
+    total: int
+
+@dataclass(slots=True)
 class Step:
     """Represents a single executable step within a goal."""
     description: str
@@ -32,33 +54,45 @@ class Step:
     status: StepStatus = StepStatus.PENDING
     validation_criteria: Optional[Dict[str, Any]] = None
     error_message: Optional[str] = None
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
+    started_at: Optional[int] = None  # time.monotonic_ns()
+    completed_at: Optional[int] = None  # time.monotonic_ns()
     element_keywords: Optional[List[str]] = None  # Optional list of keywords from element attributes for identification
+    _goal: Optional[weakref.ref] = field(default=None, init=False, repr=False, compare=False)  # Owning goal, set by Goal
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        # A changed public field makes the owning goal's cached summary and dict stale
+        if name[0] != "_":
+            goal_ref = getattr(self, "_goal", None)  # Not set yet while __init__ runs
+            goal = goal_ref() if goal_ref is not None else None
+            if goal is not None:
+                goal._invalidate()
+                if name == "status" and value is StepStatus.PENDING:
+                    goal._next_pending_index = 0  # A step went back to pending, rescan from the start
     
     def start(self) -> None:
         """Mark the step as started."""
         self.status = StepStatus.IN_PROGRESS
-        self.started_at = datetime.now()
+        self.started_at = time.monotonic_ns()
     
     def complete(self) -> None:
         """Mark the step as completed."""
         self.status = StepStatus.COMPLETED
-        self.completed_at = datetime.now()
+        self.completed_at = time.monotonic_ns()
     
     def fail(self, error_message: str) -> None:
         """Mark the step as failed with an error message."""
         self.status = StepStatus.FAILED
         self.error_message = error_message
-        self.completed_at = datetime.now()
+        self.completed_at = time.monotonic_ns()
     
     def validation_failed(self, error_message: str) -> None:
         """Mark the step as failed validation with an error message."""
         self.status = StepStatus.VALIDATION_FAILED
         self.error_message = error_message
-        self.completed_at = datetime.now()
+        self.completed_at = time.monotonic_ns()
 
-@dataclass
+@dataclass(slots=True, weakref_slot=True)
 class Goal:
     """Represents a high-level goal in the Excel automation process."""
     id: str
@@ -67,25 +101,44 @@ class Goal:
     status: GoalStatus = GoalStatus.PENDING
     validation_criteria: Optional[Dict[str, Any]] = None
     error_message: Optional[str] = None
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
+    started_at: Optional[int] = None  # time.monotonic_ns()
+    completed_at: Optional[int] = None  # time.monotonic_ns()
     dependencies: List[str] = field(default_factory=list)  # List of goal IDs that must be completed first
+    _summary: Optional[StepsSummary] = field(default=None, init=False, repr=False, compare=False)
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    _next_pending_index: int = field(default=0, init=False, repr=False, compare=False)
+    _version: int = field(default=0, init=False, repr=False, compare=False)  # Bumped on every invalidation
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name[0] != "_":
+            self._invalidate()
+            if name == "steps":
+                self._next_pending_index = 0
+                for step in value:
+                    step._goal = weakref.ref(self)
+    
+    def _invalidate(self) -> None:
+        """Drop the cached step summary and dictionary representation."""
+        self._summary = None
+        self._dict_cache = None
+        self._version = getattr(self, "_version", 0) + 1  # Not set yet while __init__ runs
     
     def start(self) -> None:
         """Mark the goal as started."""
         self.status = GoalStatus.IN_PROGRESS
-        self.started_at = datetime.now()
+        self.started_at = time.monotonic_ns()
     
     def complete(self) -> None:
         """Mark the goal as completed."""
         self.status = GoalStatus.COMPLETED
-        self.completed_at = datetime.now()
+        self.completed_at = time.monotonic_ns()
     
     def fail(self, error_message: str) -> None:
         """Mark the goal as failed with an error message."""
         self.status = GoalStatus.FAILED
         self.error_message = error_message
-        self.completed_at = datetime.now()
+        self.completed_at = time.monotonic_ns()
     
     def needs_review(self, message: str) -> None:
         """Mark the goal as needing review with a message."""
@@ -95,51 +148,90 @@ class Goal:
     def add_step(self, step: Step) -> None:
         """Add a step to the goal."""
         self.steps.append(step)
+        step._goal = weakref.ref(self)
+        self._invalidate()
+    
+    def summarize(self) -> StepsSummary:
+        """
+        Count completed, failed and pending steps in a single pass.
+        
+        The summary is cached until a field of the goal or one of its steps is assigned,
+        or the number of steps changes.
+        """
+        summary = self._summary
+        if summary is not None and summary.total == len(self.steps):
+            return summary
+        
+        completed = failed = 0
+        pending_index = -1
+        for index, step in enumerate(self.steps):
+            status = step.status
+            if status is StepStatus.COMPLETED:
+                completed += 1
+            elif status in FAILED_STEP_STATUSES:
+                failed += 1
+            elif status is StepStatus.PENDING and pending_index < 0:
+                pending_index = index
+        
+        self._summary = summary = StepsSummary(completed, failed, pending_index, len(self.steps))
+        return summary
     
     def get_next_pending_step(self) -> Optional[Step]:
         """Get the next pending step in this goal."""
-        for step in self.steps:
-            if step.status == StepStatus.PENDING:
-                return step
-        return None
+        steps = self.steps
+        index = self._next_pending_index
+        # Steps only leave PENDING as they run, so the cursor never has to move backwards
+        while index < len(steps) and steps[index].status is not StepStatus.PENDING:
+            index += 1
+        self._next_pending_index = index
+        return steps[index] if index < len(steps) else None
     
     def all_steps_completed(self) -> bool:
         """Check if all steps in this goal are completed."""
-        return all(step.status == StepStatus.COMPLETED for step in self.steps)
+        summary = self.summarize()
+        return summary.completed == summary.total
     
     def any_steps_failed(self) -> bool:
         """Check if any steps in this goal have failed."""
-        return any(step.status in [StepStatus.FAILED, StepStatus.VALIDATION_FAILED] 
-                  for step in self.steps)
+        return self.summarize().failed > 0
     
     def get_progress(self) -> float:
         """Get the progress of this goal as a percentage."""
-        if not self.steps:
+        summary = self.summarize()
+        if not summary.total:
             return 0.0
-        completed = sum(1 for step in self.steps 
-                       if step.status == StepStatus.COMPLETED)
-        return (completed / len(self.steps)) * 100
+        return (summary.completed / summary.total) * 100
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert the goal to a dictionary representation."""
-        return {
+        """
+        Convert the goal to a dictionary representation.
+        
+        The dictionary is cached until a field of the goal or one of its steps is assigned,
+        so callers must not modify it.
+        """
+        cached = self._dict_cache
+        if cached is not None and len(cached["steps"]) == len(self.steps):
+            return cached
+        
+        self._dict_cache = cached = {
             "id": self.id,
             "description": self.description,
             "status": self.status.value,
             "progress": self.get_progress(),
             "error_message": self.error_message,
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "started_at": _isoformat(self.started_at),
+            "completed_at": _isoformat(self.completed_at),
             "steps": [
                 {
                     "description": step.description,
                     "status": step.status.value,
                     "error_message": step.error_message,
-                    "started_at": step.started_at.isoformat() if step.started_at else None,
-                    "completed_at": step.completed_at.isoformat() if step.completed_at else None,
+                    "started_at": _isoformat(step.started_at),
+                    "completed_at": _isoformat(step.completed_at),
                     "element_keywords": step.element_keywords
                 }
                 for step in self.steps
             ],
             "dependencies": self.dependencies
         }
+        return cached
@@ -3,116 +3,271 @@ Goal executor for Excel LLM automation.
 Breaks down goals into executable steps and manages their execution.
 """
 
-import json
+import asyncio
+import hashlib
+import os
 import time
-import yaml
-from typing import Callable, List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, AsyncIterator, Callable, List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 from examples.states.step_executor import StepExecutor
-from openai import OpenAI
+import orjson
 
-from examples.utils.llm_helper import clean_json_format
+from examples.states.prompts import (
+    GOAL_VALIDATION_SYSTEM_PROMPT,
+    STEP_BATCH_VALIDATION_SYSTEM_PROMPT,
+    STEP_PLANNER_SYSTEM_PROMPT,
+    STEP_PLANNER_USER_TEMPLATE,
+    STEP_RECOVERY_SYSTEM_PROMPT,
+    STEP_VALIDATION_SYSTEM_PROMPT,
+)
+from examples.utils.batch_api import BatchRequest, run_batch
+from examples.utils.llm_helper import JsonArrayStream, clean_json_format
+from examples.utils.plan_cache import PlanCache
+from examples.utils.rate_limit import RateLimiter, call_with_retry
+from examples.utils.yaml_delta import YamlDeltaTracker
+from examples.utils.yaml_helper import yaml_load, yaml_dump
 
 from axplorer.macos.apps.excel_helper import flatten_and_filter
 from axplorer.macos.explorer import AccessibilityExplorer
 
-from ..models.goal import Goal, Step, GoalStatus, StepStatus
+from ..models.goal import FINISHED_STEP_STATUSES, Goal, Step, GoalStatus, StepStatus
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+
+def _jdump(obj: Any) -> str:
+    """Serialize to indented JSON for a prompt."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+
+_jload = orjson.loads
+
+
+def _write_debug_file(debug_file: Path, debug_info: Dict[str, Any]) -> None:
+    """Write a debug snapshot as YAML, runs on a debug writer thread."""
+    try:
+        # Format excel state
+        try:
+            # Try to parse and reformat the excel state as YAML
+            debug_info["excel_state"] = yaml_load(debug_info["excel_state"])
+        except Exception:
+            pass  # If parsing fails, keep the raw string
+
+        # Write debug info to unique file
+        with open(debug_file, 'w') as f:
+            yaml_dump(debug_info, f)
+    except Exception as e:
+        print(f"Failed to write debug info to {debug_file}: {e}")
 
 class GoalExecutor:
     """Executes goals by breaking them down into steps and managing their execution."""
     
-    def __init__(self, openai_client: OpenAI, llm_model : str, goals: List[Goal],
+    # Highest temperature whose replies are reused for identical requests
+    CACHE_MAX_TEMPERATURE = 0.3
+    # Completion tokens budgeted per request when estimating token usage for rate limiting
+    COMPLETION_TOKEN_ESTIMATE = 1024
+    
+    def __init__(self, openai_client: "AsyncOpenAI", llm_model : str, goals: List[Goal],
                  explorer : AccessibilityExplorer,
                  on_goal_update: Callable[[Goal], None],
                  on_steps_update: Callable[[List[Step], Optional[Step]], None],
-                 on_step_failure: Callable[[Step, str], bool]):
+                 on_step_failure: Callable[[Step, str], bool],
+                 excel_state_provider: Optional[Callable[[], Optional[str]]] = None,
+                 on_state_invalidated: Optional[Callable[[], None]] = None,
+                 plan_cache_enabled: bool = False,
+                 validation_batch_size: int = 1,
+                 batch_mode: bool = False,
+                 preplan: bool = False):
         self.llm_model = llm_model
         self.client = openai_client
         self.goals = goals
         self.explorer = explorer
         self.current_goal_index = 0
-        self.step_executor = StepExecutor(explorer)
+        self.step_executor = StepExecutor(explorer, excel_state_provider, on_state_invalidated)
         self.on_goal_update = on_goal_update
         self.on_steps_update = on_steps_update
         self.on_step_failure = on_step_failure  # Callback to ask user about replanning
+        # Number of executed steps validated together in one request, 1 validates each step as it runs
+        self.validation_batch_size = max(1, validation_batch_size)
+
+        # Replans of the same goal continue the planning conversation and only send the state delta
+        self._delta_tracker = YamlDeltaTracker()
+        self._planned_goal: Optional[Goal] = None
+        self._plan_messages: List[Dict[str, str]] = []
+
+        # Replies to low temperature calls, keyed by a hash of the model, messages and temperature
+        self._resp_cache: Dict[str, str] = {}
+        # Concurrent planning and validation requests share the account's rate limits
+        self._rate_limiter = RateLimiter()
+
+        # One line per completed goal, only ever appended to so the planner prompt prefix stays stable
+        self._completed_summary_lines: List[str] = []
+
+        # Plan all goals up front through the Batch API, for runs that are not waiting on a user
+        self.batch_mode = batch_mode
+        # Plan the next goal while the current one runs, when it does not depend on the current one
+        self.preplan = preplan
+        # (goal, planner messages, Excel state, task for the reply)
+        self._next_plan: Optional[Tuple[Goal, List[Dict[str, str]], str, asyncio.Task]] = None
+        # Plans made ahead of time, goal id -> (planner messages, reply, Excel state the plan was made against)
+        self._prepared_plans: Dict[str, Tuple[List[Dict[str, str]], str, str]] = {}
         
         # Create debug directory
         debug_dir = Path("debug")
         debug_dir.mkdir(exist_ok=True)
-        self.system_prompt = """You are an Excel automation expert. Given a specific goal and the current Excel state,
-        break down the goal into concrete, executable steps. Ensure each step is clear and achievable.
-        
-        Available actions for steps:
-        - move_to_element(element_id, element_keywords): Move mouse to element. element_keywords should be an array of 1-2 exact values from the element's attributes (e.g. ["Sheet1", "A1"] or ["addSheetTabButton"])
-        - left_click(): Click where the mouse is
-        - right_click(): Right click where the mouse is
-        - double_left_click(): Double click where the mouse is
-        - type_text(text): Type text (can include \\n and \\t)
-        - press_key_combo(key, modifiers): Press key with modifiers
-        - scroll_up(distance): Scroll up by pixels
-        - scroll_down(distance): Scroll down by pixels
-        - drag_to_element(element_id, element_keywords): Drag from current position to element. element_keywords should be an array of 1-2 exact values from the element's attributes (e.g. ["Sheet1", "A1"] or ["addSheetTabButton"])
-        
-        Important Rules to always follow:
-            - Always left_click or right_click after move_to_element to trigger a button or focus or a cell.
-            - When entering text, ending with a \n will cause the cell below to be selected, \t will cause the cell to the right to be selected
-            - press_key_combo can move to adjacent cells. Use \n to move down, \t to move right, \n modifier shift for up, \t modifier shift for let
-            - Ending text with a \n or \t, then using press_key_combo in the next step is a duplicate move. Avoid this.
-            - Inserting a sheet is performed using the addSheetTabButton
-            - Renaming a sheet is performed by double clicking on the sheet name
-            - AXValue 0 means that a button is not selected, 1 is selected. For instance Italic
-            - When selecting Number Format, first click its "children" element" to open the dropdown as a goal. Then the next goal should be to click the desired format.
-
-        Respond with a JSON array of steps, where each step has:
-        - "description": Human-readable description of the step
-        - "action": Name of the action to execute
-        - "parameters": Dictionary of parameters for the action
-        - "validation_criteria": Dictionary describing expected state after step
-        
-        Ensure this is a valid JSON array or otherwise the process will fail.
-
-        Example response:
-        [
-            {
-                "description": "Move to cell A1",
-                "action": "move_to_element",
-                "parameters": {
-                    "element_id": 123,
-                    "element_keywords": ["Sheet1", "A1"]
-                },
-                "validation_criteria": {
-                    "mouse_over_element": 123
-                }
-            },
-            {
-                "description": "Enter header text",
-                "action": "type_text",
-                "parameters": {"text": "Header\\n"},
-                "validation_criteria": {
-                    "cell_value": "Header",
-                    "cell_address": "A1"
-                }
-            }
-        ]
+        # Debug dumps are only written when AX_DEBUG is set, by background threads
+        self.debug = bool(os.environ.get("AX_DEBUG"))
+        self._debug_pool: Optional[ThreadPoolExecutor] = None  # Created on the first dump
+        self._last_debug_key: Optional[Tuple[Any, ...]] = None  # Identifies the last submitted dump
+        self.system_prompt = STEP_PLANNER_SYSTEM_PROMPT
+
+        # Steps of completed goals, reused as a template when planning a similar goal
+        self.plan_cache = PlanCache(openai_client, str(debug_dir / "plan_cache.json")) if plan_cache_enabled else None
+    
+    async def _cached_chat(self, messages: List[Dict[str, str]], temperature: float) -> str:
+        """
+        Run a chat completion and return the reply content.
+
+        Calls with a temperature of at most CACHE_MAX_TEMPERATURE are close to deterministic,
+        so their replies are cached and an identical call is answered without a round trip.
+
+        Args:
+            messages: Chat messages to send
+            temperature: Sampling temperature
+
+        Returns:
+            The content of the first choice
+        """
+        key = None
+        if temperature <= self.CACHE_MAX_TEMPERATURE:
+            key = hashlib.blake2b(
+                orjson.dumps((self.llm_model, messages, temperature), option=orjson.OPT_SORT_KEYS)
+            ).hexdigest()
+            content = self._resp_cache.get(key)
+            if content is not None:
+                return content
+
+        response = await self._throttled_chat(messages, temperature)
+        content = response.choices[0].message.content
+        if key is not None:
+            self._resp_cache[key] = content
+        return content
+
+    async def _throttled_chat(self, messages: List[Dict[str, str]], temperature: float, stream: bool = False) -> Any:
         """
+        Create a chat completion within the rate limits, retrying rate limit and server errors.
+
+        Returns:
+            The completion, or the stream of chunks if stream is set
+        """
+        if not self._rate_limiter.probed:
+            await self._rate_limiter.probe(self.client, self.llm_model)
+        # Roughly four characters per token
+        estimated_tokens = sum(len(m["content"]) for m in messages) // 4 + self.COMPLETION_TOKEN_ESTIMATE
+        async with self._rate_limiter.acquire(estimated_tokens):
+            return await call_with_retry(lambda: self.client.chat.completions.create(
+                model=self.llm_model,
+                messages=messages,
+                temperature=temperature,
+                stream=stream
+            ))
     
-    def plan_goal_execution(
+    async def plan_goal_execution(
         self, 
         goal: Goal, 
-        completed_goals: List[Goal],
         excel_state: str,
-        mouse_state: str
+        mouse_state: str,
+        failure: Optional[str] = None
     ) -> List[Step]:
-        """Plan the execution steps for a goal."""
-        messages = [
-            {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": f"""
+        """Plan the execution steps for a goal, see stream_goal_plan."""
+        return [step async for step in self.stream_goal_plan(goal, excel_state, mouse_state, failure)]
+
+    async def stream_goal_plan(
+        self,
+        goal: Goal,
+        excel_state: str,
+        mouse_state: str,
+        failure: Optional[str] = None
+    ) -> AsyncIterator[Step]:
+        """
+        Plan the execution steps for a goal, yielding each step as soon as the model has written it.
+
+        When replanning the goal that was planned last, the previous conversation is
+        continued and only the change in Excel state since that plan is sent. Otherwise,
+        if the plan cache holds the steps of a similar goal, the model is asked to adapt
+        those instead of planning from scratch. A plan made ahead of time, by
+        plan_goals_in_batch or while the previous goal ran, is used as is for the first attempt
+        if the Excel state is still the one it was made against. Otherwise its conversation is
+        continued with the change in Excel state, as for a replan.
+        """
+        prepared = self._prepared_plans.pop(goal.id, None) if failure is None else None
+        if prepared is not None:
+            messages, content, planned_state = prepared
+            self._delta_tracker.reset()
+            self._delta_tracker.update(planned_state)
+            self._planned_goal = goal
+            self._plan_messages = messages + [{"role": "assistant", "content": content}]
+            if planned_state == excel_state:
+                for step in self._parse_steps(content):
+                    yield step
+                return
+
+        delta = None
+        continued = goal is self._planned_goal and bool(self._plan_messages)
+        if continued:
+            delta = self._delta_tracker.update(excel_state)
+        else:
+            self._delta_tracker.reset()
+            self._delta_tracker.update(excel_state)
+
+        cached = None
+        if not continued and failure is None and self.plan_cache:
+            cached = await self.plan_cache.lookup(goal.description)
+
+        if continued:
+            # The delta is only left out when it would not be smaller than the full state
+            if delta is not None:
+                state = f"""Changes to the Excel State since the steps above were planned
+            (element paths are relative to the window root, unchanged_roots are identical to before):
+            {delta}"""
+            else:
+                state = f"""Current Excel State:
+            {excel_state}"""
+            if failure is None:
+                # A plan made ahead of time, earlier goals have changed the sheet since
+                reason = """The Excel State has changed since the steps above were planned, so their
+            element ids and cell contents may no longer be right."""
+            else:
+                reason = f"""The steps above did not accomplish the goal.
+            
+            Failure:
+            {failure}"""
+            messages = self._plan_messages + [
+                {"role": "user", "content": f"""
+            {reason}
+            
+            {state}
+            
+            Mouse Position:
+            {mouse_state}
+            
+            Respond with a new JSON array of steps that accomplishes the goal from the current state.
+            """}
+            ]
+        elif cached is not None:
+            messages = [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": f"""
             Goal to accomplish:
-            {json.dumps(goal.to_dict(), indent=2)}
+            {_jdump(goal.to_dict())}
             
-            Previously completed goals:
-            {json.dumps([g.to_dict() for g in completed_goals], indent=2)}
+            These steps accomplished a very similar goal before. Element ids change between
+            sessions, so adapt the steps to the current element ids using their element_keywords,
+            and adjust any step that does not fit this goal:
+            {_jdump(cached[1])}
             
             Current Excel State:
             {excel_state}
@@ -120,38 +275,73 @@ class GoalExecutor:
             Mouse Position:
             {mouse_state}
             """}
-        ]
-        
-        response = self.client.chat.completions.create(
-            model=self.llm_model,
-            messages=messages,
-            temperature=0.4
-        )
+            ]
+        else:
+            messages = self._goal_plan_messages(goal, excel_state, mouse_state)
         
+        started = time.monotonic()
+        stream = await self._throttled_chat(messages, temperature=0.4, stream=True)
+        parts = []
+        decoder = JsonArrayStream()
+        try:
+            async for chunk in stream:
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if not text:
+                    continue
+                parts.append(text)
+                for step_data in decoder.feed(text):
+                    yield self._step_from_data(step_data)
+        finally:
+            await stream.close()
+            # Also recorded when execution stopped the stream early, a replan then sees the steps that ran
+            self._planned_goal = goal
+            self._plan_messages = messages + [{"role": "assistant", "content": "".join(parts)}]
+        decoder.close()
+        if cached is not None:
+            print(f"planner: cache hit sim={cached[0]:.3f} adapted_in_{(time.monotonic() - started) * 1000:.0f}ms")
+
+    def _goal_plan_messages(
+        self,
+        goal: Goal,
+        excel_state: str,
+        mouse_state: str
+    ) -> List[Dict[str, str]]:
+        """Build the planner messages for planning a goal from scratch."""
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": STEP_PLANNER_USER_TEMPLATE.format_map({
+                "completed": "\n".join(self._completed_summary_lines) or "None",
+                "goal": _jdump(goal.to_dict()),
+                "state": excel_state,
+                "mouse": mouse_state
+            })}
+        ]
+
+    def _parse_steps(self, content: str) -> List[Step]:
+        """Parse the planner's complete reply into steps."""
         try:
             # Parse the response into a list of step dictionaries
-            steps_data = json.loads(clean_json_format(response.choices[0].message.content))
-            
-            # Convert to Step objects
-            steps = []
-            for step_data in steps_data:
-                step = Step(
-                    description=step_data["description"],
-                    action=step_data["action"],
-                    parameters=step_data["parameters"],
-                    validation_criteria=step_data.get("validation_criteria"),
-                    element_keywords=step_data["parameters"].get("element_keywords")
-                )
-                steps.append(step)
-            
-            return steps
-            
-        except json.JSONDecodeError as e:
+            steps_data = _jload(clean_json_format(content))
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Failed to parse LLM response as JSON: {e}")
-        except KeyError as e:
+        
+        # Convert to Step objects
+        return [self._step_from_data(step_data) for step_data in steps_data]
+
+    def _step_from_data(self, step_data: Dict[str, Any]) -> Step:
+        """Create a step from one item of the planner's reply."""
+        try:
+            return Step(
+                description=step_data["description"],
+                action=step_data["action"],
+                parameters=step_data["parameters"],
+                validation_criteria=step_data.get("validation_criteria"),
+                element_keywords=step_data["parameters"].get("element_keywords")
+            )
+        except (KeyError, TypeError) as e:
             raise ValueError(f"Missing required field in step data: {e}")
     
-    def validate_step_result(
+    async def validate_step_result(
         self,
         step: Step,
         excel_state: str,
@@ -161,27 +351,16 @@ class GoalExecutor:
         if not step.validation_criteria:
             return True, None
 
-        return True, None   
         messages = [
-            {"role": "system", "content": """You are an Excel automation expert.
-            Validate whether a step's execution resulted in the expected state.
-            
-            Compare the validation criteria against the current Excel and mouse state.
-            
-            Respond with a JSON object:
-            {
-                "valid": true/false,
-                "error": "Description of what's wrong" (if valid is false)
-            }
-            """},
+            {"role": "system", "content": STEP_VALIDATION_SYSTEM_PROMPT},
             {"role": "user", "content": f"""
             Step executed:
-            {json.dumps({
+            {_jdump({
                 "description": step.description,
                 "action": step.action,
                 "parameters": step.parameters,
                 "validation_criteria": step.validation_criteria
-            }, indent=2)}
+            })}
             
             Current Excel State:
             {excel_state}
@@ -193,20 +372,85 @@ class GoalExecutor:
             """}
         ]
         
-        response = self.client.chat.completions.create(
-            model=self.llm_model,
-            messages=messages,
-            temperature=0.2
-        )
+        content = await self._cached_chat(messages, temperature=0.2)
         
         try:
-            result = json.loads(clean_json_format(response.choices[0].message.content))
+            result = _jload(clean_json_format(content))
             return result["valid"], result.get("error")
             
-        except (json.JSONDecodeError, KeyError) as e:
+        except (orjson.JSONDecodeError, KeyError) as e:
             return False, f"Failed to validate step: {e}"
     
-    def handle_step_failure(
+    async def validate_step_results(
+        self,
+        pending: List[Tuple[Step, str, str]]
+    ) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Validate several executed steps with a single request.
+
+        Args:
+            pending: (step, excel_state, mouse_state) for each step, with the state captured
+                right after the step ran
+
+        Returns:
+            (valid, error) for each step, in the order of pending
+        """
+        if len(pending) == 1:
+            return [await self.validate_step_result(*pending[0])]
+
+        results: List[Tuple[bool, Optional[str]]] = [(True, None)] * len(pending)
+        # Steps without validation criteria pass without being sent
+        indices = [i for i, (step, _, _) in enumerate(pending) if step.validation_criteria]
+        if not indices:
+            return results
+
+        # Tasks after the first carry the Excel state as a delta to the previous task's state
+        # whenever that is smaller, most steps only touch a few cells
+        tracker = YamlDeltaTracker()
+        previous_state = None
+        tasks = []
+        for step, excel_state, mouse_state in (pending[i] for i in indices):
+            task: Dict[str, Any] = {
+                "step": {
+                    "description": step.description,
+                    "action": step.action,
+                    "parameters": step.parameters,
+                    "validation_criteria": step.validation_criteria
+                }
+            }
+            if excel_state == previous_state:
+                task["excel_state_unchanged"] = True
+            elif (delta := tracker.update(excel_state)) is not None:
+                task["excel_state_delta"] = delta
+            else:
+                task["excel_state"] = excel_state
+            task["mouse_state"] = mouse_state
+            tasks.append(task)
+            previous_state = excel_state
+        messages = [
+            {"role": "system", "content": STEP_BATCH_VALIDATION_SYSTEM_PROMPT},
+            {"role": "user", "content": f"""
+            Validation tasks:
+            {_jdump(tasks)}
+            
+            Validate if each step execution was successful.
+            """}
+        ]
+        
+        content = await self._cached_chat(messages, temperature=0.2)
+        
+        try:
+            batch = _jload(clean_json_format(content))
+            if len(batch) != len(indices):
+                raise ValueError(f"expected {len(indices)} results, got {len(batch)}")
+            for i, result in zip(indices, batch):
+                results[i] = (result["valid"], result.get("error"))
+            return results
+            
+        except (orjson.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            return [(False, f"Failed to validate steps: {e}")] * len(pending)
+    
+    async def handle_step_failure(
         self,
         step: Step,
         error: str,
@@ -215,21 +459,15 @@ class GoalExecutor:
     ) -> Optional[Step]:
         """Try to generate a recovery step when a step fails."""
         messages = [
-            {"role": "system", "content": """You are an Excel automation expert.
-            When a step fails, analyze the error and current state to determine a recovery step.
-            
-            Respond with either:
-            1. A JSON object describing a recovery step (same format as normal steps)
-            2. The string "ABORT" if recovery is not possible
-            """},
+            {"role": "system", "content": STEP_RECOVERY_SYSTEM_PROMPT},
             {"role": "user", "content": f"""
             Failed Step:
-            {json.dumps({
+            {_jdump({
                 "description": step.description,
                 "action": step.action,
                 "parameters": step.parameters,
                 "validation_criteria": step.validation_criteria
-            }, indent=2)}
+            })}
             
             Error:
             {error}
@@ -244,18 +482,12 @@ class GoalExecutor:
             """}
         ]
         
-        response = self.client.chat.completions.create(
-            model=self.llm_model,
-            messages=messages,
-            temperature=0.2
-        )
-        
-        content = response.choices[0].message.content.strip()
+        content = (await self._cached_chat(messages, temperature=0.2)).strip()
         if content == "ABORT":
             return None
             
         try:
-            recovery_data = json.loads(content)
+            recovery_data = _jload(content)
             return Step(
                 description=f"Recovery: {recovery_data['description']}",
                 action=recovery_data["action"],
@@ -264,32 +496,118 @@ class GoalExecutor:
                 element_keywords=recovery_data["parameters"].get("element_keywords")
             )
             
-        except (json.JSONDecodeError, KeyError) as e:
+        except (orjson.JSONDecodeError, KeyError) as e:
             return None
     
-    def execute_goals(self) -> bool:
+    def _start_preplan(self, excel_state: str, mouse_state: str) -> None:
+        """Start planning the goal after the current one in the background, if it is independent of it."""
+        index = self.current_goal_index + 1
+        if not self.preplan or self._next_plan is not None or index >= len(self.goals):
+            return
+        goal = self.goals[index]
+        if self.goals[self.current_goal_index].id in goal.dependencies or goal.id in self._prepared_plans:
+            return
+        messages = self._goal_plan_messages(goal, excel_state, mouse_state)
+        self._next_plan = goal, messages, excel_state, asyncio.create_task(self._cached_chat(messages, temperature=0.4))
+
+    async def _take_preplan(self, goal: Goal) -> None:
+        """
+        Keep the background plan for goal as a prepared plan.
+
+        Element ids and cell contents in the plan refer to the state it was made against.
+        When the previous goal has changed the sheet since, stream_goal_plan continues the
+        plan's conversation with the state delta instead of planning the goal from scratch.
+        """
+        planned_goal, messages, planned_state, task = self._next_plan
+        self._next_plan = None
+        if planned_goal is not goal:
+            task.cancel()
+            return
+        try:
+            content = await task
+        except Exception as e:
+            print(f"Planning {goal.id} ahead failed, planning it now: {e}")
+            return
+        self._prepared_plans[goal.id] = (messages, content, planned_state)
+
+    async def plan_goals_in_batch(self) -> None:
+        """
+        Plan every remaining goal against the current state with one Batch API job.
+
+        Batches cost half as much as regular requests but can take hours, so this only
+        suits runs nobody is waiting on. Goals the batch has no plan for are planned
+        as usual when they run.
+        """
+        excel_state, mouse_state = self.step_executor.get_current_state()
+        requests = []
+        messages_by_goal = {}
+        for goal in self.goals[self.current_goal_index:]:
+            messages = messages_by_goal[goal.id] = self._goal_plan_messages(goal, excel_state, mouse_state)
+            requests.append(BatchRequest(goal.id, {
+                "model": self.llm_model,
+                "messages": messages,
+                "temperature": 0.4
+            }))
+
+        contents = await run_batch(self.client, requests)
+        for goal_id, content in contents.items():
+            self._prepared_plans[goal_id] = (messages_by_goal[goal_id], content, excel_state)
+        print(f"Batch planned {len(contents)} of {len(requests)} goals")
+
+    async def execute_goals(self) -> bool:
         """Main execution loop for processing all goals."""
-        while self.current_goal_index < len(self.goals):
-            if not self.execute_current_goal():
-                return False
-        return True
+        if self.batch_mode:
+            try:
+                await self.plan_goals_in_batch()
+            except Exception as e:
+                print(f"Batch planning failed, planning goals as they run: {e}")
+        try:
+            while self.current_goal_index < len(self.goals):
+                if not await self.execute_current_goal():
+                    return False
+            return True
+        finally:
+            if self._next_plan is not None:
+                self._next_plan[3].cancel()
+                self._next_plan = None
+            # Let the debug writers finish, so the dumps are complete when control returns
+            if self._debug_pool is not None:
+                await asyncio.to_thread(self._debug_pool.shutdown, wait=True)
+                self._debug_pool = None
 
     def save_debug_info(self, excel_state: str, goal: Goal, step: Optional[Step] = None) -> None:
-        """Save debug information to a unique file for each event."""
+        """
+        Queue debug information to be saved to a unique file for each event.
+
+        Only a snapshot is taken here, a debug writer thread parses the Excel state and
+        writes the YAML. An event that repeats the previous dump (same event, step status
+        and Excel state) is skipped.
+        """
         # Determine event type based on context
         if step is None:
             event_type = "goal_state"
-            if goal.status == GoalStatus.IN_PROGRESS:
+            if goal.status is GoalStatus.IN_PROGRESS:
                 event_type = "pre_planning" if not hasattr(self, '_planning_done') else "post_planning"
                 if not hasattr(self, '_planning_done'):
                     self._planning_done = True
         else:
             event_type = "step_state"
-            if step.status == StepStatus.IN_PROGRESS:
+            if step.status is StepStatus.IN_PROGRESS:
                 event_type = "pre_step"
-            elif step.status in [StepStatus.COMPLETED, StepStatus.FAILED]:
+            elif step.status in FINISHED_STEP_STATUSES:
                 event_type = "post_step"
 
+        debug_key = (
+            event_type,
+            goal.status,
+            id(step),
+            step.status if step else None,
+            hashlib.blake2b(excel_state.encode()).digest()
+        )
+        if debug_key == self._last_debug_key:
+            return
+        self._last_debug_key = debug_key
+
         # Create unique filename with timestamp and event type
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
         debug_file = Path("debug") / f"debug_{timestamp}_{event_type}.yaml"
@@ -311,92 +629,134 @@ class GoalExecutor:
                 "error_message": step.error_message
             }
 
-        # Format excel state
-        try:
-            # Try to parse and reformat the excel state as YAML
-            excel_data = yaml.safe_load(excel_state)
-            debug_info["excel_state"] = excel_data
-        except Exception:
-            # If parsing fails, store as raw string
-            debug_info["excel_state"] = excel_state
+        debug_info["excel_state"] = excel_state
+        if self._debug_pool is None:
+            self._debug_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="debug-writer")
+        self._debug_pool.submit(_write_debug_file, debug_file, debug_info)
 
-        # Write debug info to unique file
-        with open(debug_file, 'w') as f:
-            yaml.dump(debug_info, f, sort_keys=False, allow_unicode=True, default_flow_style=False)
+    async def execute_current_goal(self, failure: Optional[str] = None) -> bool:
+        """
+        Execute current goal and manage its lifecycle.
 
-    def execute_current_goal(self) -> bool:
-        """Execute current goal and manage its lifecycle."""
+        Args:
+            failure: Why the previous plan for this goal failed, when replanning
+        """
         current_goal = self.goals[self.current_goal_index]
         current_goal.status = GoalStatus.IN_PROGRESS
         self.on_goal_update(current_goal)
 
         try:
             excel_state, mouse_state = self.step_executor.get_current_state()
-            # Save initial state before planning
-            self.save_debug_info(excel_state, current_goal)
-            # Plan steps for current goal
-            steps = self.plan_goal_execution(
-                current_goal,
-                self.goals[:self.current_goal_index],
-                excel_state,
-                mouse_state
-            )
-            # Save state after planning
-            self.save_debug_info(excel_state, current_goal)
-            self.on_steps_update(steps, None)  # No current step yet when first planned
-
-            # Execute and validate each step
-            for step in steps:
-                step.status = StepStatus.IN_PROGRESS
-                print(f"Executing step: {step.description}")
-                print(f"Action: {step.action}")
-                print(f"Parameters: {step.parameters}")
-                if step.element_keywords:
-                    print(f"Element Keywords: {step.element_keywords}")
-
-                if eid := step.parameters.get("element_id"):
-                    print(f"{eid}: {flatten_and_filter(self.step_executor.query_element(eid))}")
-                
-                self.on_steps_update(steps, step)
-
-                # Save state before step execution
-                excel_state, mouse_state = self.step_executor.get_current_state()
-                self.save_debug_info(excel_state, current_goal, step)
-                
-                # Execute the step
-                success, error = self.step_executor.execute_step(step)
-                if not success:
-                    step.status = StepStatus.FAILED
+            if self._next_plan is not None and failure is None:
+                await self._take_preplan(current_goal)
+            # Plan steps for current goal in the background, so execution starts with the first
+            # streamed step while the rest are still being written
+            steps: List[Step] = []
+            planned: asyncio.Queue = asyncio.Queue()
+            planning = asyncio.create_task(self._collect_plan(
+                self.stream_goal_plan(
+                    current_goal,
+                    excel_state,
+                    mouse_state,
+                    failure
+                ),
+                steps,
+                planned
+            ))
+            self._start_preplan(excel_state, mouse_state)
+            if self.debug:
+                self.save_debug_info(excel_state, current_goal)
+
+            # Execute and validate each step, validating up to validation_batch_size steps per request
+            pending: List[Tuple[Step, str, str]] = []
+            failed: Optional[Tuple[Step, str]] = None  # Step that failed and why
+            try:
+                step = await planned.get()
+                if self.debug:
+                    # Save state after planning
+                    self.save_debug_info(excel_state, current_goal)
+                self.on_steps_update(steps, None)  # No current step yet when first planned
+
+                while step is not None:
+                    step.start()
+                    print(f"Executing step: {step.description}")
+                    print(f"Action: {step.action}")
+                    print(f"Parameters: {step.parameters}")
+                    if step.element_keywords:
+                        print(f"Element Keywords: {step.element_keywords}")
+
+                    if self.debug and (eid := step.parameters.get("element_id")):
+                        print(f"{eid}: {flatten_and_filter(self.step_executor.query_element(eid))}")
+                    
                     self.on_steps_update(steps, step)
-                    if self.on_step_failure(step, error or "Step execution failed"):
-                        return self.execute_current_goal()  # Restart with new plan
-                    return False
 
-                # Get fresh state for validation and save post-execution state
-                excel_state, mouse_state = self.step_executor.get_current_state()
-                self.save_debug_info(excel_state, current_goal, step)
-                
-                # Validate the step result
-                success, error = self.validate_step_result(step, excel_state, mouse_state)
-                if not success:
-                    step.status = StepStatus.FAILED
+                    if self.debug:
+                        # Save state before step execution
+                        excel_state, mouse_state = self.step_executor.get_current_state()
+                        self.save_debug_info(excel_state, current_goal, step)
+                    
+                    # Execute the step
+                    success, error = await self.step_executor.execute_step(step)
+                    if not success:
+                        # execute_step already marked the step as failed
+                        self.on_steps_update(steps, step)
+                        failed = step, error or "Step execution failed"
+                        break
+
+                    # Get fresh state for validation
+                    excel_state, mouse_state = self.step_executor.get_current_state()
+                    pending.append((step, excel_state, mouse_state))
+                    next_step = None
+                    # The plan may still be streaming, so whether this is the last step is only
+                    # known once the next one arrives
+                    fetched = len(pending) < self.validation_batch_size
+                    if fetched:
+                        next_step = await planned.get()
+
+                    if self.debug:
+                        # Save post-execution state
+                        self.save_debug_info(excel_state, current_goal, step)
+                    if next_step is None:
+                        results = await self.validate_step_results(pending)
+                        validated, pending = pending, []
+                        for (validated_step, _, _), (success, error) in zip(validated, results):
+                            if not success:
+                                failed = validated_step, error or "Step validation failed"
+                                validated_step.validation_failed(failed[1])
+                                self.on_steps_update(steps, validated_step)
+                                break
+                        if failed:
+                            break
+
                     self.on_steps_update(steps, step)
-                    if self.on_step_failure(step, error or "Step validation failed"):
-                        return self.execute_current_goal()  # Restart with new plan
-                    return False
+                    if self.debug:
+                        # Save state after step completion
+                        excel_state, mouse_state = self.step_executor.get_current_state()
+                        self.save_debug_info(excel_state, current_goal, step)
+                    step = next_step if fetched else await planned.get()
 
-                step.status = StepStatus.COMPLETED
-                self.on_steps_update(steps, step)
-                # Save state after step completion
-                excel_state, mouse_state = self.step_executor.get_current_state()
-                self.save_debug_info(excel_state, current_goal, step)
+                # Surface planning errors once the plan has been fully consumed
+                if failed is None:
+                    await planning
+            finally:
+                planning.cancel()
+
+            if failed:
+                failed_step, error = failed
+                if self.on_step_failure(failed_step, error):
+                    return await self.execute_current_goal(f"{failed_step.description}: {error}")  # Restart with new plan
+                return False
 
             # Mark goal as complete and move to next
             current_goal.status = GoalStatus.COMPLETED
+            self._completed_summary_lines.append(f"- {current_goal.description}: DONE")
             self.on_goal_update(current_goal)
-            # Save final state after goal completion
-            excel_state, mouse_state = self.step_executor.get_current_state()
-            self.save_debug_info(excel_state, current_goal)
+            if self.plan_cache:
+                await self.plan_cache.store(current_goal.description, steps)
+            if self.debug:
+                # Save final state after goal completion
+                excel_state, mouse_state = self.step_executor.get_current_state()
+                self.save_debug_info(excel_state, current_goal)
             self.current_goal_index += 1
             return True
 
@@ -405,7 +765,16 @@ class GoalExecutor:
             self.on_goal_update(current_goal)
             raise e
 
-    def validate_goal_completion(
+    async def _collect_plan(self, plan: AsyncIterator[Step], steps: List[Step], planned: asyncio.Queue) -> None:
+        """Append each planned step to steps and queue it for execution, queueing None at the end."""
+        try:
+            async for step in plan:
+                steps.append(step)
+                planned.put_nowait(step)
+        finally:
+            planned.put_nowait(None)
+
+    async def validate_goal_completion(
         self,
         goal: Goal,
         excel_state: str
@@ -415,19 +784,10 @@ class GoalExecutor:
             return True, None
             
         messages = [
-            {"role": "system", "content": """You are an Excel automation expert.
-            Validate whether a goal has been fully completed by checking its validation criteria
-            against the current Excel state.
-            
-            Respond with a JSON object:
-            {
-                "completed": true/false,
-                "error": "Description of what's missing" (if completed is false)
-            }
-            """},
+            {"role": "system", "content": GOAL_VALIDATION_SYSTEM_PROMPT},
             {"role": "user", "content": f"""
             Goal:
-            {json.dumps(goal.to_dict(), indent=2)}
+            {_jdump(goal.to_dict())}
             
             Current Excel State:
             {excel_state}
@@ -436,15 +796,11 @@ class GoalExecutor:
             """}
         ]
         
-        response = self.client.chat.completions.create(
-            model=self.llm_model,
-            messages=messages,
-            temperature=0.2
-        )
+        content = await self._cached_chat(messages, temperature=0.2)
         
         try:
-            result = json.loads(response.choices[0].message.content)
+            result = _jload(content)
             return result["completed"], result.get("error")
             
-        except (json.JSONDecodeError, KeyError) as e:
+        except (orjson.JSONDecodeError, KeyError) as e:
             return False, f"Failed to validate goal completion: {e}"
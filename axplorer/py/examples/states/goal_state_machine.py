@@ -3,9 +3,8 @@ Goal state machine for managing the lifecycle of goals in Excel automation.
 """
 
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, Callable, List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass
-from openai import OpenAI
 
 from axplorer.macos.apps.excel_helper import get_compact_excel_yaml
 from axplorer.macos.explorer import AccessibilityExplorer
@@ -13,6 +12,9 @@ from axplorer.macos.explorer import AccessibilityExplorer
 from ..models.goal import Goal, GoalStatus
 from .high_level_planner import HighLevelPlanner
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
 class GoalState(Enum):
     """States for the goal state machine."""
     CREATING_GOALS = "creating_goals"
@@ -58,7 +60,15 @@ class GoalStateMachine:
     Handles all LLM interactions and goal state transitions.
     """
     
-    def __init__(self, openai_client: OpenAI, llm_model : str, explorer: AccessibilityExplorer):
+    # Review choice -> (next state, whether more input is needed)
+    REVIEW_TRANSITIONS = {
+        ReviewChoice.ACCEPT: (GoalState.GOALS_ACCEPTED, False),
+        ReviewChoice.MODIFY: (GoalState.AWAITING_FEEDBACK, True),
+        ReviewChoice.REJECT: (GoalState.CONFIRMING_REJECTION, True)
+    }
+    
+    def __init__(self, openai_client: "OpenAI", llm_model : str, explorer: AccessibilityExplorer,
+                 excel_state_provider: Optional[Callable[[], Optional[str]]] = None):
         self.client = openai_client
         self.state = GoalState.CREATING_GOALS
         self.goals: List[Goal] = []
@@ -67,6 +77,20 @@ class GoalStateMachine:
         self.feedback_history: List[str] = []  # Track feedback history
         self.original_request: Optional[str] = None  # Store original request
         self.explorer = explorer
+        self.excel_state_provider = excel_state_provider or (lambda: get_compact_excel_yaml(explorer))
+        
+        # (state, event) -> handler taking the event's keyword arguments
+        self._transitions: Dict[Tuple[GoalState, GoalEvent], Callable[..., GoalStateResult]] = {
+            (GoalState.CREATING_GOALS, GoalEvent.PLAN_CREATED): self._on_plan_created,
+            (GoalState.REVIEWING_GOALS, GoalEvent.REVIEW_CHOICE_MADE):
+                lambda **kwargs: self._handle_review_choice(kwargs.get('choice')),
+            (GoalState.AWAITING_FEEDBACK, GoalEvent.FEEDBACK_PROVIDED):
+                lambda **kwargs: self._handle_plan_feedback(kwargs['feedback']),
+            (GoalState.CONFIRMING_REJECTION, GoalEvent.CONFIRM_REJECTION):
+                lambda **kwargs: self._handle_rejection_confirmation(kwargs.get('confirm', '')),
+            (GoalState.GOALS_ACCEPTED, GoalEvent.GOALS_COMPLETED): self._on_goals_finished,
+            (GoalState.GOALS_ACCEPTED, GoalEvent.GOALS_FAILED): self._on_goals_finished,
+        }
     
     def handle_event(self, event: GoalEvent, **kwargs) -> GoalStateResult:
         """
@@ -84,41 +108,35 @@ class GoalStateMachine:
             GoalStateResult containing new state and goals
         """
         try:
-            match (self.state, event):
-                case (GoalState.CREATING_GOALS, GoalEvent.PLAN_CREATED):
-                    # Store original request when first creating plan
-                    self.original_request = kwargs['user_request']
-                    self.feedback_history = []  # Reset feedback history
-                    return self._handle_plan_creation(kwargs['user_request'])
-                    
-                case (GoalState.REVIEWING_GOALS, GoalEvent.REVIEW_CHOICE_MADE):
-                    return self._handle_review_choice(kwargs.get('choice'))
-                    
-                case (GoalState.AWAITING_FEEDBACK, GoalEvent.FEEDBACK_PROVIDED):
-                    return self._handle_plan_feedback(kwargs['feedback'])
-                    
-                case (GoalState.CONFIRMING_REJECTION, GoalEvent.CONFIRM_REJECTION):
-                    return self._handle_rejection_confirmation(kwargs.get('confirm', ''))
-
-                case (GoalState.GOALS_ACCEPTED, GoalEvent.GOALS_COMPLETED) | (GoalState.GOALS_ACCEPTED, GoalEvent.GOALS_FAILED):
-                    self.state = GoalState.CREATING_GOALS
-                    return GoalStateResult(self.state, [])
-                    
-                case (_, GoalEvent.ERROR_OCCURRED):
-                    return self._handle_error(kwargs.get('error', 'Unknown error occurred'))
-                    
-                case _:
-                    return self._handle_error(f"Invalid event {event} for state {self.state}")
+            if event is GoalEvent.ERROR_OCCURRED:
+                return self._handle_error(kwargs.get('error', 'Unknown error occurred'))
+            
+            handler = self._transitions.get((self.state, event))
+            if handler is None:
+                return self._handle_error(f"Invalid event {event} for state {self.state}")
+            return handler(**kwargs)
         
         except Exception as e:
             return self._handle_error(str(e))
     
+    def _on_plan_created(self, **kwargs) -> GoalStateResult:
+        """Start a new plan for the user's request."""
+        # Store original request when first creating plan
+        self.original_request = kwargs['user_request']
+        self.feedback_history = []  # Reset feedback history
+        return self._handle_plan_creation(kwargs['user_request'])
+    
+    def _on_goals_finished(self, **kwargs) -> GoalStateResult:
+        """Go back to creating goals once the accepted goals have run."""
+        self.state = GoalState.CREATING_GOALS
+        return GoalStateResult(self.state, [])
+    
     def _handle_plan_creation(self, user_request: str) -> GoalStateResult:
         """Handle plan creation and transition to reviewing state."""
         try:
-            excel_state = get_compact_excel_yaml(self.explorer)
+            excel_state = self.excel_state_provider()
             # Generate new goals using high level planner
-            self.goals = self.high_level_planner.generate_plan(user_request, excel_state)
+            self.goals = list(self.high_level_planner.generate_plan(user_request, excel_state))
             
             # Validate plan structure
             if not self.high_level_planner.validate_plan(self.goals):
@@ -151,30 +169,12 @@ class GoalStateMachine:
                 needs_input=True
             )
         
-        match choice:
-            case ReviewChoice.ACCEPT:
-                self.state = GoalState.GOALS_ACCEPTED
-                return GoalStateResult(
-                    new_state=self.state,
-                    goals=self.goals,
-                    needs_input=False
-                )
-            
-            case ReviewChoice.MODIFY:
-                self.state = GoalState.AWAITING_FEEDBACK
-                return GoalStateResult(
-                    new_state=self.state,
-                    goals=self.goals,
-                    needs_input=True
-                )
-            
-            case ReviewChoice.REJECT:
-                self.state = GoalState.CONFIRMING_REJECTION
-                return GoalStateResult(
-                    new_state=self.state,
-                    goals=self.goals,
-                    needs_input=True
-                )
+        self.state, needs_input = self.REVIEW_TRANSITIONS[choice]
+        return GoalStateResult(
+            new_state=self.state,
+            goals=self.goals,
+            needs_input=needs_input
+        )
     
     def _handle_rejection_confirmation(self, confirm: Optional[ConfirmChoice]) -> GoalStateResult:
         """Handle confirmation of plan rejection."""
@@ -211,7 +211,7 @@ class GoalStateMachine:
         try:
             # Add new feedback to history
             self.feedback_history.append(feedback)
-            excel_state = get_compact_excel_yaml(self.explorer)
+            excel_state = self.excel_state_provider()
             
             # Combine original request with all feedback
             enhanced_request = self.original_request or ""
@@ -3,101 +3,145 @@ High-level planner for Excel LLM automation.
 Generates initial goal plans and handles user feedback.
 """
 
-import json
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterator, List, Dict, Any, Optional, Tuple
 from datetime import datetime
+import heapq
 import uuid
-from openai import OpenAI
+import weakref
 
-from examples.utils.llm_helper import clean_json_format
+import orjson
+
+from examples.states.prompts import (
+    GOAL_FEEDBACK_USER_TEMPLATE,
+    GOAL_PLANNER_SYSTEM_PROMPT,
+    GOAL_PLANNER_USER_TEMPLATE,
+)
+from examples.utils.llm_helper import JsonArrayStream
 
 from ..models.goal import Goal, Step, GoalStatus, StepStatus
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+@dataclass
+class _PlanIndex:
+    """Dependency bookkeeping for a plan, so the next ready goal is found without rescanning it."""
+    goals: List[Goal]  # The plan this index was built for
+    by_id: Dict[str, Goal]
+    reverse_deps: Dict[str, List[str]]  # Goal id -> ids of the goals depending on it
+    pending_dep_count: Dict[str, int]  # Goal id -> number of dependencies not completed yet
+    position: Dict[str, int]  # Goal id -> index of the goal in the plan
+    ready: List[Tuple[int, str]]  # Heap of (position, goal id) of goals whose dependencies are all completed
+    parked: List[str] = field(default_factory=list)  # Ready goals that were neither pending nor completed
+
+    @classmethod
+    def build(cls, goals: List[Goal]) -> "_PlanIndex":
+        by_id = {goal.id: goal for goal in goals}
+        reverse_deps: Dict[str, List[str]] = {goal.id: [] for goal in goals}
+        pending_dep_count = {}
+        for goal in goals:
+            count = 0
+            for dep_id in goal.dependencies:
+                dep = by_id.get(dep_id)
+                if dep is None or dep.status is not GoalStatus.COMPLETED:
+                    count += 1
+                if dep is not None:
+                    reverse_deps[dep_id].append(goal.id)
+            pending_dep_count[goal.id] = count
+        position = {goal.id: i for i, goal in enumerate(goals)}
+        # Built in plan order, so the list already is a heap
+        ready = [(position[goal.id], goal.id) for goal in goals
+                 if not pending_dep_count[goal.id] and goal.status is not GoalStatus.COMPLETED]
+        return cls(goals, by_id, reverse_deps, pending_dep_count, position, ready)
+    
+    def push(self, goal_id: str) -> None:
+        """Mark a goal as ready, keeping the ready goals in plan order."""
+        heapq.heappush(self.ready, (self.position[goal_id], goal_id))
+
+    def complete(self, goal_id: str) -> None:
+        """Release the goals that depended on a now completed goal."""
+        for dependent in self.reverse_deps[goal_id]:
+            self.pending_dep_count[dependent] -= 1
+            if not self.pending_dep_count[dependent]:
+                self.push(dependent)
+
+
 class HighLevelPlanner:
     """Plans high-level goals for Excel automation tasks."""
     
-    def __init__(self, openai_client: OpenAI, llm_model : str):
+    # Routes planner requests to servers holding the cached system prompt prefix
+    PROMPT_CACHE_KEY = "excel_planner_v1"
+    
+    def __init__(self, openai_client: "OpenAI", llm_model : str):
         self.llm_model = llm_model
         self.client = openai_client
-        self.system_prompt = """You are an Excel automation expert. Given a user request and Excel window state,
-        create a high-level plan breaking down the task into clear, achievable goals.
-        
-        Each goal should be specific and independently verifiable. Goals should be sequenced logically,
-        with any dependencies clearly identified. A goal should be high level, representing a change in Excel book, 
-        such as completion of a set data entered, creation of a new sheet, insertion of a pivot table, etc.
-
-        Goals should avoid actions that significantly alter the Excel state, such as switching ribbon tabs, creating new sheets, 
-        or adding charts. This is because these changes modify the context, and the system needs the updated state to correctly 
-        generate the next set of actions to achieve the goal.
-
-        Analyze the Current Excel State, looking at existing sheets, and fields.
-        
-        Respond with a JSON array of goals, where each goal has:
-        - "id": A unique string identifier
-        - "description": Clear description of what needs to be accomplished
-        - "validation_criteria": Dictionary of criteria to verify goal completion
-        - "dependencies": Array of goal IDs that must be completed first (or empty array if none)
+        self.system_prompt = GOAL_PLANNER_SYSTEM_PROMPT
+        self._plan_index: Optional[_PlanIndex] = None  # Built by get_next_goal for the current plan
+        # Goal id -> (goal, version, step count, JSON) of the goal's last serialization
+        self._serialized: Dict[str, Tuple[weakref.ref, int, int, bytes]] = {}
+    
+    def _stream_goals_data(self, messages: List[Dict[str, str]]) -> Iterator[Dict[str, Any]]:
+        """Stream the reply to messages, yielding each goal dictionary as soon as it is complete."""
+        stream = self.client.chat.completions.create(
+            model=self.llm_model,
+            messages=messages,
+            temperature=0.7,
+            stream=True,
+            extra_body={"prompt_cache_key": self.PROMPT_CACHE_KEY}
+        )
+        decoder = JsonArrayStream()
+        try:
+            for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                yield from decoder.feed(chunk.choices[0].delta.content)
+                if decoder.done:
+                    break
+        finally:
+            stream.close()
+        decoder.close()
+    
+    def _serialize_goals(self, goals: List[Goal]) -> str:
+        """Serialize goals as a compact JSON array, reusing the JSON of goals unchanged since the last call."""
+        serialized = {}
+        parts = []
+        for goal in goals:
+            entry = self._serialized.get(goal.id)
+            if (entry is None or entry[0]() is not goal or entry[1] != goal._version
+                    or entry[2] != len(goal.steps)):
+                entry = (weakref.ref(goal), goal._version, len(goal.steps), orjson.dumps(goal.to_dict()))
+            serialized[goal.id] = entry
+            parts.append(entry[3])
+        self._serialized = serialized
+        return (b"[" + b",".join(parts) + b"]").decode()
+    
+    def generate_plan(self, user_request: str, excel_state: str) -> Iterator[Goal]:
+        """
+        Generate a high-level plan from the user request and Excel state.
         
-        Example response:
-        [
-            {
-                "id": "g1",
-                "description": "Select and format header row",
-                "validation_criteria": {
-                    "header_cells": ["A1", "B1", "C1"],
-                    "expected_format": "bold"
-                },
-                "dependencies": []
-            },
-            {
-                "id": "g2",
-                "description": "Enter data in columns A through C",
-                "validation_criteria": {
-                    "filled_ranges": ["A2:A10", "B2:B10", "C2:C10"]
-                },
-                "dependencies": ["g1"]
-            }
-        ]
+        Goals are yielded while the reply is still streaming, callers needing the whole
+        plan wrap the call in list().
         """
-    
-    def generate_plan(self, user_request: str, excel_state: str) -> List[Goal]:
-        """Generate a high-level plan from the user request and Excel state."""
         messages = [
             {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": f"""
-            User Request: {user_request}
-            
-            Current Excel State:
-            {excel_state}
-            
-            Generate a plan of goals to accomplish this task.
-            """}
+            {"role": "user", "content": GOAL_PLANNER_USER_TEMPLATE.format_map({
+                "request": user_request,
+                "state": excel_state
+            })}
         ]
         
-        response = self.client.chat.completions.create(
-            model=self.llm_model,
-            messages=messages,
-            temperature=0.7
-        )
-        
         try:
-            # Parse the response into a list of goal dictionaries
-            goals_data = json.loads(clean_json_format(response.choices[0].message.content))
-            
-            # Convert to Goal objects
-            goals = []
-            for goal_data in goals_data:
-                goal = Goal(
+            # Convert each goal dictionary to a Goal as it arrives
+            for goal_data in self._stream_goals_data(messages):
+                yield Goal(
                     id=goal_data["id"],
                     description=goal_data["description"],
                     validation_criteria=goal_data.get("validation_criteria"),
                     dependencies=goal_data.get("dependencies", [])
                 )
-                goals.append(goal)
-            
-            return goals
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Failed to parse LLM response as JSON: {e}")
         except KeyError as e:
             raise ValueError(f"Missing required field in goal data: {e}")
@@ -106,32 +150,20 @@ class HighLevelPlanner:
         """Update the plan based on user feedback."""
         messages = [
             {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": f"""
-            Current Goals:
-            {json.dumps([goal.to_dict() for goal in goals], indent=2)}
-            
-            User Feedback:
-            {feedback}
-            
-            Generate an updated plan incorporating this feedback.
-            """}
+            {"role": "user", "content": GOAL_FEEDBACK_USER_TEMPLATE.format_map({
+                "goals": self._serialize_goals(goals),
+                "feedback": feedback
+            })}
         ]
         
-        response = self.client.chat.completions.create(
-            model=self.llm_model,
-            messages=messages,
-            temperature=0.7
-        )
-        
         try:
-            # Parse the updated goals
-            updated_goals_data = json.loads(response.choices[0].message.content)
+            self._plan_index = None  # The plan changes, its dependency index has to be rebuilt
             
             # Convert to Goal objects while preserving progress of existing goals
             updated_goals = []
             existing_goals = {goal.id: goal for goal in goals}
             
-            for goal_data in updated_goals_data:
+            for goal_data in self._stream_goals_data(messages):
                 goal_id = goal_data["id"]
                 if goal_id in existing_goals:
                     # Update existing goal while preserving its progress
@@ -152,56 +184,86 @@ class HighLevelPlanner:
             
             return updated_goals
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Failed to parse LLM response as JSON: {e}")
         except KeyError as e:
             raise ValueError(f"Missing required field in goal data: {e}")
     
     def validate_plan(self, goals: List[Goal]) -> bool:
-        """Validate that the plan is properly structured."""
-        # Check for duplicate IDs
-        goal_ids = [goal.id for goal in goals]
-        if len(goal_ids) != len(set(goal_ids)):
-            return False
+        """
+        Validate that the plan is properly structured.
         
-        # Check for circular dependencies
+        Goal ids must be unique, every dependency must name a goal of the plan and the
+        dependencies must not form a cycle. Runs a single iterative depth-first search,
+        O(goals + dependencies).
+        """
+        # Check for duplicate IDs while indexing the goals
+        goal_dict: Dict[str, Goal] = {}
         for goal in goals:
-            if not self._check_dependencies(goal, goals, set()):
+            if goal.id in goal_dict:
                 return False
+            goal_dict[goal.id] = goal
         
-        return True
-    
-    def _check_dependencies(self, goal: Goal, all_goals: List[Goal], visited: set) -> bool:
-        """Check for circular dependencies starting from a goal."""
-        if goal.id in visited:
-            return False
-        
-        visited.add(goal.id)
-        goal_dict = {g.id: g for g in all_goals}
-        
-        for dep_id in goal.dependencies:
-            if dep_id not in goal_dict:
-                return False
-            if not self._check_dependencies(goal_dict[dep_id], all_goals, visited.copy()):
-                return False
+        # Check for missing and circular dependencies.
+        # Goals are white until visited, gray while on the DFS stack and black once finished.
+        WHITE, GRAY, BLACK = 0, 1, 2
+        color = dict.fromkeys(goal_dict, WHITE)
+        for root in goal_dict:
+            if color[root] != WHITE:
+                continue
+            color[root] = GRAY
+            stack = [(root, iter(goal_dict[root].dependencies))]
+            while stack:
+                goal_id, deps = stack[-1]
+                for dep_id in deps:
+                    dep_color = color.get(dep_id)
+                    if dep_color is None or dep_color == GRAY:
+                        return False  # Unknown goal or back edge
+                    if dep_color == WHITE:
+                        color[dep_id] = GRAY
+                        stack.append((dep_id, iter(goal_dict[dep_id].dependencies)))
+                        break
+                else:
+                    color[goal_id] = BLACK
+                    stack.pop()
         
         return True
     
     def get_next_goal(self, goals: List[Goal]) -> Optional[Goal]:
-        """Get the next goal that is ready to be worked on."""
-        goal_dict = {goal.id: goal for goal in goals}
+        """
+        Get the next goal that is ready to be worked on.
         
-        for goal in goals:
-            if goal.status != GoalStatus.PENDING:
-                continue
-                
-            # Check if all dependencies are completed
-            deps_completed = all(
-                goal_dict[dep_id].status == GoalStatus.COMPLETED
-                for dep_id in goal.dependencies
-            )
-            
-            if deps_completed:
+        Returns the first pending goal in plan order whose dependencies are all completed.
+        The dependency index is built on the first call for a plan. Later calls only look at
+        the goals handed out before, releasing their dependents once they are completed and
+        handing them out again once they are back to pending.
+        """
+        index = self._plan_index
+        if index is None or index.goals is not goals or len(index.by_id) != len(goals):
+            index = self._plan_index = _PlanIndex.build(goals)
+        
+        # Parked goals (in progress, failed or under review) may have been completed or reset since
+        if index.parked:
+            parked = index.parked
+            index.parked = []
+            for goal_id in parked:
+                status = index.by_id[goal_id].status
+                if status is GoalStatus.COMPLETED:
+                    index.complete(goal_id)
+                elif status is GoalStatus.PENDING:
+                    index.push(goal_id)
+                else:
+                    index.parked.append(goal_id)
+        
+        ready = index.ready
+        while ready:
+            goal = index.by_id[ready[0][1]]
+            if goal.status is GoalStatus.PENDING:
                 return goal
+            heapq.heappop(ready)
+            if goal.status is GoalStatus.COMPLETED:
+                index.complete(goal.id)
+            else:
+                index.parked.append(goal.id)
         
-        return None
\ No newline at end of file
+        return None
@@ -3,7 +3,10 @@ Step executor for Excel LLM automation.
 Handles execution and validation of individual automation steps.
 """
 
-from typing import Dict, Any, Optional, Tuple, Callable
+import asyncio
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple, Callable
+import functools
 import time
 from datetime import datetime
 
@@ -21,47 +24,81 @@ from axplorer.macos.action import (
 )
 from axplorer.macos.apps.excel_helper import flatten_excel_cells, get_compact_excel_yaml
 
+from examples.utils.wait import wait_until_ready
+
 from ..models.goal import Step, StepStatus
 
 class StepExecutor:
     """Executes and validates individual automation steps."""
     
-    def __init__(self, explorer: AccessibilityExplorer):
+    # Map of action names to their execution functions, called with the executor and the step parameters
+    ACTION_HANDLERS: Mapping[str, Callable[["StepExecutor", Dict[str, Any]], None]] = MappingProxyType({
+        'move_to_element': lambda self, params: self._handle_move_to_element(params),
+        'left_click': lambda self, _: left_click(),
+        'right_click': lambda self, _: right_click(),
+        'double_left_click': lambda self, _: double_left_click(),
+        'type_text': lambda self, params: self._handle_type_text(params),
+        'press_key_combo': lambda self, params: self._handle_key_combo(params),
+        'scroll_up': lambda self, params: scroll_up(params.get('distance', 800)),
+        'scroll_down': lambda self, params: scroll_down(params.get('distance', 800)),
+        'drag_to_element': lambda self, params: self._handle_drag_to_element(params)
+    })
+    
+    # Excel is raised again only if the last raise is older than this, in seconds
+    RAISE_INTERVAL = 2.0
+    # Longest wait for the window to settle before and after an action, in milliseconds
+    SETTLE_MAX_MS = 500
+    
+    def __init__(self, explorer: AccessibilityExplorer,
+                 excel_state_provider: Optional[Callable[[], Optional[str]]] = None,
+                 on_invalidate: Optional[Callable[[], None]] = None):
         self.explorer = explorer
+        self.excel_state_provider = excel_state_provider or (lambda: get_compact_excel_yaml(explorer))
+        # Called by invalidate_state, so a caching excel_state_provider also reads the UI again
+        self.on_invalidate = on_invalidate
+        
+        # Excel state from the last get_current_state and the explorer's state token when it was read,
+        # reused until an action or a reported UI change may have changed it
+        self._state_dirty = True
+        self._cached_state: Optional[Tuple[Optional[int], str]] = None
+        # Bumped whenever the UI may have changed, element queries are cached per version
+        self._state_version = 0
+        self._query_element_cached = functools.lru_cache(maxsize=256)(self._query_element)
         
-        # Map of action names to their execution functions
-        self.action_handlers: Dict[str, Callable] = {
-            'move_to_element': self._handle_move_to_element,
-            'left_click': lambda _: left_click(),
-            'right_click': lambda _: right_click(),
-            'double_left_click': lambda _: double_left_click(),
-            'type_text': self._handle_type_text,
-            'press_key_combo': self._handle_key_combo,
-            'scroll_up': lambda params: scroll_up(params.get('distance', 800)),
-            'scroll_down': lambda params: scroll_down(params.get('distance', 800)),
-            'drag_to_element': self._handle_drag_to_element
-        }
+        # time.monotonic() of the last raise_application call
+        self._last_raise = 0.0
     
-    def execute_step(self, step: Step) -> Tuple[bool, Optional[str]]:
-        """Execute a single automation step."""
+    async def execute_step(self, step: Step) -> Tuple[bool, Optional[str]]:
+        """
+        Execute a single automation step.
+        
+        The blocking accessibility calls and settle waits run in worker threads, so other tasks
+        on the event loop (such as a plan still streaming in) keep running meanwhile.
+        """
+        self.invalidate_state()
         try:
-            # Ensure Excel is in foreground
-            raise_application("Microsoft Excel")
-            time.sleep(0.5)  # Brief pause to ensure window is ready
+            # Ensure Excel is in foreground, unless it was raised moments ago
+            now = time.monotonic()
+            if now - self._last_raise > self.RAISE_INTERVAL:
+                await asyncio.to_thread(raise_application, "Microsoft Excel")
+                self._last_raise = now
+                await asyncio.to_thread(wait_until_ready, self.explorer, max_ms=self.SETTLE_MAX_MS)
             
             # Mark step as started
             step.start()
             
             # Get the handler for this action
-            handler = self.action_handlers.get(step.action)
+            handler = self.ACTION_HANDLERS.get(step.action)
             if not handler:
                 step.fail(f"Unknown action: {step.action}")
                 return False, f"Unknown action: {step.action}"
             
             # Execute the action
             try:
-                handler(step.parameters)
-                time.sleep(0.5)  # Brief pause after action
+                await asyncio.to_thread(handler, self, step.parameters)
+                await asyncio.to_thread(wait_until_ready, self.explorer, max_ms=self.SETTLE_MAX_MS)
+                # Again after the action, in case the state was read while it ran
+                self.invalidate_state()
                 step.complete()
                 return True, None
                 
@@ -118,12 +155,29 @@ class StepExecutor:
         
         drag_to_element(self.explorer, "Main", element_id_int)
     
+    def invalidate_state(self) -> None:
+        """Make the next get_current_state and query_element read the UI again, call after acting on the UI."""
+        self._state_dirty = True
+        self._state_version += 1
+        if self.on_invalidate is not None:
+            self.on_invalidate()
+    
     def get_current_state(self) -> Tuple[str, str]:
-        """Get the current Excel window and mouse state."""
-        # Get main window YAML
-        excel_state = get_compact_excel_yaml(self.explorer)
-        if not excel_state:
-            raise RuntimeError("Failed to get Excel window state")
+        """
+        Get the current Excel window and mouse state.
+        
+        The Excel state is cached until the next executed step, invalidate_state call or change
+        of the explorer's state token. The mouse state is small and always read again.
+        """
+        token = self.explorer.state_token()
+        if self._state_dirty or self._cached_state is None or self._cached_state[0] != token:
+            # Get main window YAML
+            excel_state = self.excel_state_provider()
+            if not excel_state:
+                raise RuntimeError("Failed to get Excel window state")
+            self._cached_state = token, excel_state
+            self._state_dirty = False
+        excel_state = self._cached_state[1]
         
         # Get mouse position element info
         mouse_state = self.explorer.get_element_at_mouse_position_yaml(0)
@@ -141,6 +195,9 @@ class StepExecutor:
             return False
 
     def query_element(self, idx) -> str:
-        """Get the current Excel window and mouse state."""
-        # Get main window YAML
+        """Get an element's YAML, cached until the next executed step or invalidate_state call."""
+        return self._query_element_cached(idx, self._state_version)
+    
+    def _query_element(self, idx, state_version: int) -> str:
+        """Query an element's YAML, state_version only keys the cache."""
         return self.explorer.get_query_element_yaml("Main", idx, 0)
@@ -34,10 +34,10 @@ def test_high_level_planning():
     
     # Test plan generation
     print("\nTesting plan generation...")
-    goals = planner.generate_plan(
+    goals = list(planner.generate_plan(
         "Create a simple sales report with headers in row 1 and data in rows 2-5",
         excel_state
-    )
+    ))
     
     print(f"\nGenerated {len(goals)} goals:")
     for goal in goals:
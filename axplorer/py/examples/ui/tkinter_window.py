@@ -5,8 +5,9 @@ Displays goals, tasks, and handles user interaction.
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import List, Optional, Callable, Dict
-from threading import Lock, Thread
+from collections import deque
+from typing import Deque, List, Optional, Callable, Dict
+from threading import Event, Lock, Thread, current_thread, main_thread
 import time
 from datetime import datetime
 
@@ -15,6 +16,33 @@ from ..models.goal import Goal, Step, GoalStatus, StepStatus
 class AutomationUI:
     """Enhanced Tkinter UI for Excel automation."""
     
+    # Status and log level -> display symbol
+    GOAL_SYMBOLS = {
+        GoalStatus.PENDING: "⭕",
+        GoalStatus.IN_PROGRESS: "🔄",
+        GoalStatus.COMPLETED: "✅",
+        GoalStatus.FAILED: "❌",
+        GoalStatus.NEEDS_REVIEW: "❓"
+    }
+    STEP_SYMBOLS = {
+        StepStatus.PENDING: "⭕",
+        StepStatus.IN_PROGRESS: "🔄",
+        StepStatus.COMPLETED: "✅",
+        StepStatus.FAILED: "❌",
+        StepStatus.VALIDATION_FAILED: "⚠️"
+    }
+    LEVEL_SYMBOLS = {
+        "info": "ℹ️",
+        "success": "✅",
+        "warning": "⚠️",
+        "error": "❌"
+    }
+    
+    # Log messages arriving within this delay are written to the log in one insert
+    LOG_FLUSH_DELAY_MS = 50
+    # Lines kept in the output log
+    LOG_MAX_LINES = 500
+    
     def __init__(self):
         # Create the window
         self.root = tk.Tk()
@@ -40,10 +68,11 @@ class AutomationUI:
         self.thread_lock = Lock()
         self.active_thread = None
         
-        self._setup_ui()
+        # Log lines waiting for the next flush
+        self._pending_log: Deque[str] = deque(maxlen=self.LOG_MAX_LINES)
+        self._log_flush_scheduled = False
         
-        # Update GUI periodically
-        self.root.after(100, self._process_events)
+        self._setup_ui()
     
     def _setup_ui(self):
         """Set up the UI components."""
@@ -117,11 +146,28 @@ class AutomationUI:
         # Bind Enter key to submit
         self.input_entry.bind('<Return>', lambda e: self._handle_input())
     
-    def _process_events(self):
-        """Process GUI events to keep window responsive."""
+    def _run_on_ui_thread(self, func: Callable, *args) -> bool:
+        """
+        Run func on the Tk thread: directly when called from it, otherwise through the event loop.
+        
+        Returns:
+            False if the window was closed and func will not run
+        """
+        if current_thread() is main_thread():
+            func(*args)
+            return True
+        try:
+            self.root.after(0, func, *args)
+            return True
+        except (tk.TclError, RuntimeError):
+            # Window was closed or the event loop has stopped
+            return False
+    
+    def _replace_text(self, widget: tk.Text, text: str):
+        """Replace the whole content of a text widget, must run on the Tk thread."""
         try:
-            self.root.update()
-            self.root.after(50, self._process_events)
+            widget.delete(1.0, tk.END)
+            widget.insert(tk.END, text)
         except tk.TclError:
             # Window was closed
             pass
@@ -154,98 +200,82 @@ class AutomationUI:
     
     def _format_goal_status(self, status: GoalStatus) -> str:
         """Format goal status for display."""
-        status_symbols = {
-            GoalStatus.PENDING: "⭕",
-            GoalStatus.IN_PROGRESS: "🔄",
-            GoalStatus.COMPLETED: "✅",
-            GoalStatus.FAILED: "❌",
-            GoalStatus.NEEDS_REVIEW: "❓"
-        }
-        return status_symbols.get(status, "⚪")
+        return self.GOAL_SYMBOLS.get(status, "⚪")
     
     def _format_step_status(self, status: StepStatus) -> str:
         """Format step status for display."""
-        status_symbols = {
-            StepStatus.PENDING: "⭕",
-            StepStatus.IN_PROGRESS: "🔄",
-            StepStatus.COMPLETED: "✅",
-            StepStatus.FAILED: "❌",
-            StepStatus.VALIDATION_FAILED: "⚠️"
-        }
-        return status_symbols.get(status, "⚪")
+        return self.STEP_SYMBOLS.get(status, "⚪")
     
     def update_goals(self, goals: List[Goal]):
         """Update the goals display."""
-        try:
-            with self.lock:
-                self.goals_text.delete(1.0, tk.END)
-                for goal in goals:
-                    status = self._format_goal_status(goal.status)
-                    progress = f"{goal.get_progress():.1f}%"
-                    self.goals_text.insert(tk.END, 
-                        f"{status} [{progress}] {goal.description}\n")
-                    if goal.error_message:
-                        self.goals_text.insert(tk.END,
-                            f"   ⚠️ {goal.error_message}\n")
-        except tk.TclError:
-            # Window was closed
-            pass
+        # Build the whole text first, so the widget is rewritten with a single insert
+        lines = []
+        goal_symbols = self.GOAL_SYMBOLS
+        for goal in goals:
+            status = goal_symbols.get(goal.status, "⚪")
+            progress = f"{goal.get_progress():.1f}%"
+            lines.append(f"{status} [{progress}] {goal.description}\n")
+            if goal.error_message:
+                lines.append(f"   ⚠️ {goal.error_message}\n")
+        self._run_on_ui_thread(self._replace_text, self.goals_text, "".join(lines))
     
     def update_tasks(self, goal: Optional[Goal], steps: List[Step], current_step: Optional[Step] = None):
         """Update the task list display."""
-        try:
-            with self.lock:
-                # Update display
-                self.task_text.delete(1.0, tk.END)
-                
-                # Display goal and steps
-                if goal:
-                    self.task_text.insert(tk.END, f"Goal: {goal.description}\n")
-                    self.task_text.insert(tk.END, "Steps:\n")
+        # Build the whole text first, so the widget is rewritten with a single insert
+        lines = []
+        if goal:
+            lines.append(f"Goal: {goal.description}\n")
+            lines.append("Steps:\n")
 
-                    # Find current step index
-                    current_step_index = -1
-                    if current_step:
-                        for i, step in enumerate(steps):
-                            if step == current_step:
-                                current_step_index = i
-                                break
+            # Find current step index by identity, Step equality would compare every field
+            current_step_index = -1
+            if current_step is not None:
+                current_step_index = next((i for i, step in enumerate(steps) if step is current_step), -1)
 
-                    # Display all steps with appropriate status
-                    for i, step in enumerate(steps):
-                        if i < current_step_index:
-                            # Steps before current are completed
-                            status = self._format_step_status(StepStatus.COMPLETED)
-                        elif i == current_step_index:
-                            # Current step keeps its actual status (In Progress or Failed)
-                            status = self._format_step_status(step.status)
-                        else:
-                            # Steps after current are pending
-                            status = self._format_step_status(StepStatus.PENDING)
-                            
-                        self.task_text.insert(tk.END, f"{status} {step.description}\n")
-                        if step.error_message and i == current_step_index:
-                            self.task_text.insert(tk.END, f"⚠️ {step.error_message}\n")
-        except tk.TclError:
-            # Window was closed
-            pass
+            # Display all steps with appropriate status
+            completed_symbol = self.STEP_SYMBOLS[StepStatus.COMPLETED]
+            pending_symbol = self.STEP_SYMBOLS[StepStatus.PENDING]
+            for i, step in enumerate(steps):
+                if i < current_step_index:
+                    # Steps before current are completed
+                    status = completed_symbol
+                elif i == current_step_index:
+                    # Current step keeps its actual status (In Progress or Failed)
+                    status = self.STEP_SYMBOLS.get(step.status, "⚪")
+                else:
+                    # Steps after current are pending
+                    status = pending_symbol
+                    
+                lines.append(f"{status} {step.description}\n")
+                if step.error_message and i == current_step_index:
+                    lines.append(f"⚠️ {step.error_message}\n")
+        self._run_on_ui_thread(self._replace_text, self.task_text, "".join(lines))
     
     def log_message(self, message: str, level: str = "info"):
         """Add a message to the output log."""
+        timestamp = time.strftime("%I:%M:%S %p")
+        symbol = self.LEVEL_SYMBOLS.get(level, "•")
+        with self.lock:
+            self._pending_log.append(f"{timestamp} {symbol} {message}\n")
+            if self._log_flush_scheduled:
+                return
+            self._log_flush_scheduled = True
         try:
-            with self.lock:
-                timestamp = time.strftime("%I:%M:%S %p")
-                level_symbols = {
-                    "info": "ℹ️",
-                    "success": "✅",
-                    "warning": "⚠️",
-                    "error": "❌"
-                }
-                symbol = level_symbols.get(level, "•")
-                
-                self.log_text.insert(tk.END,
-                    f"{timestamp} {symbol} {message}\n")
-                self.log_text.see(tk.END)
+            self.root.after(self.LOG_FLUSH_DELAY_MS, self._flush_log)
+        except (tk.TclError, RuntimeError):
+            # Window was closed or the event loop has stopped
+            pass
+    
+    def _flush_log(self):
+        """Write the pending log messages with one insert, keeping the newest LOG_MAX_LINES lines."""
+        with self.lock:
+            text = "".join(self._pending_log)
+            self._pending_log.clear()
+            self._log_flush_scheduled = False
+        try:
+            self.log_text.insert(tk.END, text)
+            self.log_text.delete(1.0, f"end-{self.LOG_MAX_LINES + 1}l")
+            self.log_text.see(tk.END)
         except tk.TclError:
             # Window was closed
             pass
@@ -259,14 +289,27 @@ class AutomationUI:
         self.root.mainloop()
     
     def ask_yes_no(self, question: str) -> bool:
-        """Display a yes/no dialog and return the user's choice."""
-        try:
-            with self.lock:
-                result = messagebox.askyesno("Question", question)
-                return result
-        except tk.TclError:
-            # Window was closed
+        """
+        Display a yes/no dialog and return the user's choice.
+        
+        Called from a worker thread, the dialog is shown by the Tk thread and the caller waits for the answer.
+        """
+        answer = []
+        answered = Event()
+        
+        def ask():
+            try:
+                answer.append(messagebox.askyesno("Question", question))
+            except tk.TclError:
+                # Window was closed
+                pass
+            finally:
+                answered.set()
+        
+        if not self._run_on_ui_thread(ask):
             return False
+        answered.wait()
+        return bool(answer and answer[0])
 
     def cleanup(self):
         """Clean up resources."""
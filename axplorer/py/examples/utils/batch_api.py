@@ -0,0 +1,80 @@
+"""
+Helpers for submitting chat completions through the OpenAI Batch API
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List
+
+import orjson
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+CHAT_COMPLETIONS_ENDPOINT = "/v1/chat/completions"
+
+# Batch statuses after which the batch no longer changes
+TERMINAL_BATCH_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+@dataclass(slots=True)
+class BatchRequest:
+    """A chat completion request queued for a batch."""
+    custom_id: str  # Used to match the result back to the request
+    body: Dict[str, Any]  # Chat completion parameters (model, messages, temperature, ...)
+
+    def to_jsonl(self) -> bytes:
+        """Serialize the request as a line of the batch input file."""
+        return orjson.dumps({
+            "custom_id": self.custom_id,
+            "method": "POST",
+            "url": CHAT_COMPLETIONS_ENDPOINT,
+            "body": self.body,
+        })
+
+
+async def run_batch(client: "AsyncOpenAI", requests: List[BatchRequest],
+                    completion_window: str = "24h", poll_interval: float = 5.0,
+                    max_poll_interval: float = 300.0) -> Dict[str, str]:
+    """
+    Submit chat completion requests as one batch and wait for the results.
+
+    Args:
+        client: Client used to upload the input file and manage the batch
+        requests: Requests to submit, each with a unique custom_id
+        completion_window: Time the batch is allowed to take
+        poll_interval: Initial delay between status checks in seconds, doubled after each check
+        max_poll_interval: Upper bound for the delay between status checks in seconds
+
+    Returns:
+        Reply content by custom_id. Requests that failed are left out.
+
+    Raises:
+        RuntimeError: If the batch did not complete
+    """
+    batch_input = b"\n".join(request.to_jsonl() for request in requests)
+    input_file = await client.files.create(file=("batch.jsonl", batch_input), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=CHAT_COMPLETIONS_ENDPOINT,
+        completion_window=completion_window
+    )
+
+    delay = poll_interval
+    while batch.status not in TERMINAL_BATCH_STATUSES:
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_poll_interval)
+        batch = await client.batches.retrieve(batch.id)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+
+    output = await client.files.content(batch.output_file_id)
+    results = {}
+    for line in output.content.splitlines():
+        if not line:
+            continue
+        record = orjson.loads(line)
+        response = record.get("response")
+        if response and response["status_code"] == 200:
+            results[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+    return results
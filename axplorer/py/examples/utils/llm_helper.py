@@ -1,6 +1,107 @@
+import re
+from typing import Any, List
+
+import orjson
+
+
 def clean_json_format(json_string : str):
-    if json_string.startswith("```json\n"):
-        json_string = json_string[8:]  # Remove opening delimiter
-    if json_string.endswith("\n```"):
-        json_string = json_string[:-4]  # Remove closing delimiter
-    return json_string
\ No newline at end of file
+    if json_string[:1] in ("[", "{") and json_string[-1:] in ("]", "}"):
+        return json_string  # Unfenced, nothing to strip
+    # Each call only copies the string when the delimiter is present
+    return json_string.removeprefix("```json\n").removesuffix("\n```")
+
+
+class JsonArrayStream:
+    """
+    Decodes the items of a JSON array as its text arrives in chunks, e.g. from a streamed LLM reply.
+
+    Text before the opening bracket (such as a ```json fence) and after the closing bracket is ignored.
+    Item boundaries are found by tracking bracket depth, and each complete item is parsed once with orjson.
+    """
+    _structural = re.compile(r'["\\{}\[\],]')
+
+    def __init__(self):
+        self._buffer = ""  # Text of the item being read
+        self._scanned = 0  # Length of the buffer already scanned
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._started = False
+        self.done = False  # Set once the closing bracket has been read
+
+    def feed(self, text: str) -> List[Any]:
+        """
+        Add a chunk of text.
+
+        Returns:
+            Items of the array that were completed by this chunk
+        """
+        if self.done:
+            return []
+        buffer = self._buffer + text
+        if not self._started:
+            start = buffer.find("[")
+            if start < 0:
+                self._buffer = buffer
+                return []
+            buffer = buffer[start + 1:]
+            self._scanned = 0
+            self._started = True
+
+        items = []
+        item_start = 0
+        # Position of a character escaped by a backslash, which ends neither a string nor an item
+        skip = self._scanned if self._escaped else -1
+        self._escaped = False
+        for match in self._structural.finditer(buffer, self._scanned):
+            pos = match.start()
+            if pos == skip:
+                continue
+            char = buffer[pos]
+            if self._in_string:
+                if char == "\\":
+                    if pos + 1 < len(buffer):
+                        skip = pos + 1
+                    else:
+                        self._escaped = True  # The escaped character is in the next chunk
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    # Closing bracket of the array itself, the last item may be a bare value
+                    self._append(items, buffer[item_start:pos])
+                    item_start = pos + 1
+                    self.done = True
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    self._append(items, buffer[item_start:pos + 1])
+                    item_start = pos + 1
+            elif char == "," and self._depth == 0:
+                self._append(items, buffer[item_start:pos])
+                item_start = pos + 1
+
+        self._buffer = buffer[item_start:]
+        self._scanned = len(buffer) - item_start
+        return items
+
+    @staticmethod
+    def _append(items: List[Any], text: str) -> None:
+        """Parse an item's text and append it, ignoring separators between items."""
+        if text.strip():
+            items.append(orjson.loads(text))
+
+    def close(self) -> None:
+        """
+        Check that the whole array was read.
+
+        Raises:
+            ValueError: If the text ended before the array was closed
+        """
+        if not self.done:
+            raise ValueError(f"JSON array is incomplete, unparsed text: {self._buffer[:200]!r}")
@@ -0,0 +1,108 @@
+"""
+Semantic cache of executed step plans, keyed by goal description embeddings
+"""
+import math
+import os
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+
+from examples.models import Step
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+# Parameters that only identify elements in one particular window walk
+VOLATILE_PARAMETERS = frozenset({"element_id"})
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity of two equal-length vectors."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def step_template(step: Step) -> Dict[str, Any]:
+    """Reduce an executed step to the parts that carry over to a similar goal."""
+    return {
+        "description": step.description,
+        "action": step.action,
+        "parameters": {k: v for k, v in step.parameters.items() if k not in VOLATILE_PARAMETERS},
+        "element_keywords": step.element_keywords,
+    }
+
+
+class PlanCache:
+    """
+    Remembers the steps that completed a goal and finds them again for similar goals.
+
+    Entries hold the embedding of the goal description and the step templates. Lookups
+    compare embeddings by cosine similarity, so this is meant for the few hundred goals
+    of a working session rather than a large corpus.
+    """
+
+    def __init__(self, client: "AsyncOpenAI", path: Optional[str] = None,
+                 threshold: float = 0.90, embedding_model: str = "text-embedding-3-small"):
+        """
+        Args:
+            client: Client used to compute embeddings
+            path: JSON file to persist entries to, or None to keep them in memory only
+            threshold: Minimum cosine similarity for a hit
+            embedding_model: Embedding model name
+        """
+        self.client = client
+        self.path = path
+        self.threshold = threshold
+        self.embedding_model = embedding_model
+        self._entries: List[Dict[str, Any]] = []
+        self._embeddings: Dict[str, List[float]] = {}  # Goal description -> embedding, saves a call on store
+        if path and os.path.exists(path):
+            with open(path, "rb") as file:
+                self._entries = orjson.loads(file.read())
+
+    async def _embed(self, text: str) -> List[float]:
+        embedding = self._embeddings.get(text)
+        if embedding is None:
+            response = await self.client.embeddings.create(model=self.embedding_model, input=text)
+            embedding = self._embeddings[text] = response.data[0].embedding
+        return embedding
+
+    async def lookup(self, goal_description: str) -> Optional[Tuple[float, List[Dict[str, Any]]]]:
+        """
+        Find the steps of the most similar cached goal.
+
+        Args:
+            goal_description: Description of the goal to plan
+
+        Returns:
+            Tuple of (similarity, step templates) for the best entry at or above the
+            threshold, or None if there is no such entry
+        """
+        if not self._entries:
+            return None
+        embedding = await self._embed(goal_description)
+        similarity, entry = max(((_cosine(embedding, e["embedding"]), e) for e in self._entries),
+                                key=lambda pair: pair[0])
+        if similarity < self.threshold:
+            return None
+        return similarity, entry["steps"]
+
+    async def store(self, goal_description: str, steps: List[Step]) -> None:
+        """
+        Cache the steps that completed a goal, replacing any entry for the same description.
+
+        Args:
+            goal_description: Description of the completed goal
+            steps: The executed steps
+        """
+        embedding = await self._embed(goal_description)
+        self._entries = [e for e in self._entries if e["description"] != goal_description]
+        self._entries.append({
+            "description": goal_description,
+            "embedding": embedding,
+            "steps": [step_template(step) for step in steps],
+        })
+        if self.path:
+            with open(self.path, "wb") as file:
+                file.write(orjson.dumps(self._entries))
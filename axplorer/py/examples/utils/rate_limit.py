@@ -0,0 +1,115 @@
+"""
+Client-side request and token rate limiting with retries for OpenAI calls
+"""
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: rate limited, or a transient server side failure
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+class _Bucket:
+    """Token bucket holding up to one minute's allowance, refilled continuously."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    async def take(self, amount: int) -> None:
+        """Wait until amount is available, then take it."""
+        amount = min(amount, self.capacity)  # A request larger than the bucket would never fit
+        while True:
+            now = time.monotonic()
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity / 60)
+            self.updated = now
+            if self.level >= amount:
+                self.level -= amount
+                return
+            await asyncio.sleep((amount - self.level) * 60 / self.capacity)
+
+
+class RateLimiter:
+    """
+    Keeps requests within the account's requests and tokens per minute.
+
+    Limits can be given up front or read from the rate limit headers of a probe request.
+    Without limits only the number of concurrent requests is bounded.
+    """
+
+    def __init__(self, max_concurrent: int = 8, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        """
+        Args:
+            max_concurrent: Maximum number of requests in flight
+            rpm: Requests per minute, or None if unknown
+            tpm: Tokens per minute, or None if unknown
+        """
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._requests: Optional[_Bucket] = None
+        self._tokens: Optional[_Bucket] = None
+        self.probed = False
+        self.set_limits(rpm, tpm)
+
+    def set_limits(self, rpm: Optional[int], tpm: Optional[int]) -> None:
+        """Replace the per minute limits, None removes a limit."""
+        self._requests = _Bucket(rpm) if rpm else None
+        self._tokens = _Bucket(tpm) if tpm else None
+
+    async def probe(self, client: "AsyncOpenAI", model: str) -> None:
+        """
+        Read the model's limits from the headers of a one token request.
+
+        Failures are reported and leave the current limits in place.
+        """
+        self.probed = True
+        try:
+            response = await client.chat.completions.with_raw_response.create(
+                model=model,
+                messages=[{"role": "user", "content": "hi"}],
+                max_tokens=1
+            )
+            rpm = response.headers.get("x-ratelimit-limit-requests")
+            tpm = response.headers.get("x-ratelimit-limit-tokens")
+            self.set_limits(int(rpm) if rpm else None, int(tpm) if tpm else None)
+        except Exception as e:
+            print(f"Could not read rate limits for {model}: {e}")
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int) -> AsyncIterator[None]:
+        """Hold a request slot, after taking one request and estimated_tokens from the buckets."""
+        async with self._semaphore:
+            if self._requests is not None:
+                await self._requests.take(1)
+            if self._tokens is not None:
+                await self._tokens.take(estimated_tokens)
+            yield
+
+
+async def call_with_retry(call: Callable[[], Awaitable[T]], max_attempts: int = 6,
+                          min_wait: float = 1.0, max_wait: float = 60.0) -> T:
+    """
+    Await call(), retrying rate limit and transient server errors with random exponential backoff.
+
+    Args:
+        call: Creates the awaitable to run, called once per attempt
+        max_attempts: Attempts before the last error is raised
+        min_wait: Upper bound of the first backoff in seconds
+        max_wait: Upper bound of any backoff in seconds
+    """
+    attempt = 0
+    while True:
+        try:
+            return await call()
+        except Exception as e:
+            if getattr(e, "status_code", None) not in RETRYABLE_STATUS_CODES or attempt + 1 >= max_attempts:
+                raise
+            await asyncio.sleep(random.uniform(0, min(max_wait, min_wait * 2 ** attempt)))
+            attempt += 1
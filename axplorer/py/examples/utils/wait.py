@@ -0,0 +1,33 @@
+"""
+Readiness polling for freshly launched or raised applications
+"""
+import time
+
+from axplorer import AccessibilityExplorer
+
+
+def wait_until_ready(explorer: AccessibilityExplorer, max_ms: int = 3000, poll_ms: int = 25) -> bool:
+    """
+    Wait until the main window fingerprint stops changing.
+
+    Returns as soon as two consecutive polls see the same fingerprint, so a warm
+    application costs a single poll interval instead of a fixed sleep.
+
+    Args:
+        explorer: Explorer for the application to wait on
+        max_ms: Maximum time to wait in milliseconds
+        poll_ms: Interval between fingerprint checks in milliseconds
+
+    Returns:
+        bool: True if the window settled, False if max_ms elapsed first
+    """
+    deadline = time.monotonic() + max_ms / 1000
+    previous = None
+    while True:
+        fingerprint = explorer.get_main_window_fingerprint()
+        if fingerprint is not None and fingerprint == previous:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        previous = fingerprint
+        time.sleep(poll_ms / 1000)
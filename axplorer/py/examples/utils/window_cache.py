@@ -0,0 +1,72 @@
+"""
+Main window YAML cache keyed on the explorer's window fingerprint
+"""
+import os
+from typing import Dict, Optional, Tuple
+
+from axplorer import AccessibilityExplorer
+
+
+class MainWindowCache:
+    """Skips full main window walks while the window fingerprint is unchanged."""
+
+    def __init__(self, explorer: AccessibilityExplorer):
+        self.explorer = explorer
+        self._fingerprint: Optional[int] = None
+        self._max_depth: Optional[int] = None
+        self._yaml: Optional[str] = None
+        self._dumped: Dict[str, Tuple[float, Optional[int], int]] = {}
+
+    def get_yaml(self, max_depth: int) -> Optional[str]:
+        """
+        Get the main window YAML, re-walking the hierarchy only when the window changed.
+
+        The element map used by move_to_element and friends is refreshed together with
+        the YAML, so a cache hit also means the stored element ids are still current.
+
+        Args:
+            max_depth: Maximum depth to traverse
+
+        Returns:
+            str: YAML string if successful, None otherwise
+        """
+        fingerprint = self.explorer.get_main_window_fingerprint()
+        if (fingerprint is None or fingerprint != self._fingerprint
+                or max_depth != self._max_depth or self._yaml is None):
+            self._yaml = self.explorer.get_main_window_yaml(max_depth)
+            self._fingerprint = fingerprint if self._yaml else None
+            self._max_depth = max_depth
+        return self._yaml
+
+    def invalidate(self) -> None:
+        """Force the next get_yaml call to walk the hierarchy."""
+        self._fingerprint = None
+
+    def dump(self, path: str, max_depth: int) -> bool:
+        """
+        Dump the main window YAML to a file, skipping the walk if the file is already current.
+
+        Args:
+            path: File to write
+            max_depth: Maximum depth to traverse
+
+        Returns:
+            bool: True if the file holds the current hierarchy, False if the dump failed
+        """
+        fingerprint = self.explorer.get_main_window_fingerprint()
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+
+        if fingerprint is not None and self._dumped.get(path) == (mtime, fingerprint, max_depth):
+            return True
+
+        if not self.explorer.dump_main_window_yaml(path, max_depth):
+            self._dumped.pop(path, None)
+            return False
+
+        # The dump refreshed the element map, so the cached string no longer matches it
+        self._yaml = None
+        self._dumped[path] = (os.path.getmtime(path), fingerprint, max_depth)
+        return True
@@ -0,0 +1,105 @@
+"""
+Element-level deltas between successive accessibility YAML dumps
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from examples.utils.yaml_helper import yaml_dump, yaml_load
+
+# Per element path: (fingerprint of its own keys, fingerprint of its whole subtree)
+Fingerprints = Dict[str, Tuple[int, int]]
+
+
+def _own_fields(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Get an element without its children. Flattened Excel cells keep value and description at the top level."""
+    return {k: v for k, v in node.items() if k != "children"}
+
+
+def _fingerprint_tree(tree: Any, prefix: str, fingerprints: Fingerprints) -> None:
+    """Record own and subtree fingerprints for every element below tree."""
+    if not isinstance(tree, dict):
+        return
+    for key, node in tree.items():
+        if not isinstance(node, dict):
+            continue
+        path = f"{prefix}/{key}" if prefix else key
+        own = hash(orjson.dumps(_own_fields(node), option=orjson.OPT_SORT_KEYS, default=str))
+        children = node.get("children")
+        _fingerprint_tree(children, path, fingerprints)
+        child_paths = (f"{path}/{child}" for child in children) if isinstance(children, dict) else ()
+        subtree = hash((own, tuple(fingerprints[p][1] for p in child_paths if p in fingerprints)))
+        fingerprints[path] = (own, subtree)
+
+
+class YamlDeltaTracker:
+    """
+    Tracks the last accessibility YAML sent to the LLM and reports only what changed since.
+
+    Elements are identified by their path of element keys from the root. Unchanged
+    subtrees are collapsed to their root path, elements whose own keys changed
+    (or that are new) are reported without their children, and vanished subtrees are
+    listed by root path.
+    """
+
+    def __init__(self):
+        self._fingerprints: Optional[Fingerprints] = None
+
+    def reset(self) -> None:
+        """Forget the baseline, so the next update starts over."""
+        self._fingerprints = None
+
+    def update(self, yaml_str: str) -> Optional[str]:
+        """
+        Make yaml_str the new baseline and describe how it differs from the previous one.
+
+        Args:
+            yaml_str: YAML hierarchy as returned by get_main_window_yaml / get_compact_excel_yaml
+
+        Returns:
+            str: Delta YAML with changed, removed and unchanged_roots sections, or None
+                if there was no baseline or the delta would not be smaller than yaml_str
+        """
+        tree = yaml_load(yaml_str)
+        fingerprints: Fingerprints = {}
+        _fingerprint_tree(tree, "", fingerprints)
+
+        previous, self._fingerprints = self._fingerprints, fingerprints
+        if previous is None:
+            return None
+
+        changed: Dict[str, Any] = {}
+        unchanged_roots: List[str] = []
+        self._collect_changes(tree, "", previous, changed, unchanged_roots)
+        # Only report the root of each vanished subtree
+        removed = []
+        for path in previous:
+            if path not in fingerprints:
+                parent = path.rpartition("/")[0]
+                if not parent or parent in fingerprints:
+                    removed.append(path)
+
+        delta = yaml_dump({
+            "changed": changed,
+            "removed": sorted(removed),
+            "unchanged_roots": unchanged_roots,
+        })
+        return delta if len(delta) < len(yaml_str) else None
+
+    def _collect_changes(self, tree: Any, prefix: str, previous: Fingerprints,
+                         changed: Dict[str, Any], unchanged_roots: List[str]) -> None:
+        """Walk tree, skipping subtrees whose fingerprint matches the previous baseline."""
+        if not isinstance(tree, dict):
+            return
+        for key, node in tree.items():
+            if not isinstance(node, dict):
+                continue
+            path = f"{prefix}/{key}" if prefix else key
+            own, subtree = self._fingerprints[path]
+            before = previous.get(path)
+            if before is not None and before[1] == subtree:
+                unchanged_roots.append(path)
+                continue
+            if before is None or before[0] != own:
+                changed[path] = _own_fields(node)
+            self._collect_changes(node.get("children"), path, previous, changed, unchanged_roots)
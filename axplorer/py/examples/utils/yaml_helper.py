@@ -0,0 +1,46 @@
+"""
+YAML helpers that prefer the libyaml C loader/dumper when available
+"""
+import os
+from typing import Any, Optional, TextIO
+
+import orjson
+import yaml
+
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+
+def yaml_load(stream: Any) -> Any:
+    """Parse a YAML string or stream with the fastest available safe loader."""
+    return yaml.load(stream, Loader=_Loader)
+
+
+def yaml_dump(data: Any, stream: Optional[TextIO] = None) -> Optional[str]:
+    """Serialize data to YAML with the fastest available safe dumper, preserving key order."""
+    return yaml.dump(data, stream, Dumper=_Dumper, sort_keys=False,
+                     allow_unicode=True, default_flow_style=False)
+
+
+def load_tree(path: str) -> Any:
+    """
+    Load a YAML dump, using a JSON sidecar (path + ".json") when it is at least as new.
+
+    A stale or missing sidecar is regenerated from the YAML, so the next load only
+    pays for JSON parsing.
+    """
+    json_path = path + ".json"
+    try:
+        if os.path.getmtime(json_path) >= os.path.getmtime(path):
+            with open(json_path, "rb") as file:
+                return orjson.loads(file.read())
+    except (OSError, orjson.JSONDecodeError):
+        pass
+
+    with open(path, "rb") as file:
+        tree = yaml_load(file)
+    with open(json_path, "wb") as file:
+        file.write(orjson.dumps(tree))
+    return tree
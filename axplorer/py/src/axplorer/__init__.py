@@ -5,7 +5,7 @@ This package provides tools for exploring and interacting with application acces
 interfaces across different platforms.
 """
 
-import platform
+import sys
 from typing import List, Optional
 
 # Re-export common types
@@ -18,7 +18,7 @@ from .types import (
 )
 
 # Platform-specific imports
-if platform.system() == "Darwin":
+if sys.platform == "darwin":
     from .macos.explorer import AccessibilityExplorer
     from .macos.utils import (
         is_accessibility_enabled,
@@ -28,7 +28,7 @@ if platform.system() == "Darwin":
     )
 else:
     raise NotImplementedError(
-        f"Platform {platform.system()} is not currently supported"
+        f"Platform {sys.platform} is not currently supported"
     )
 
 # Common functionality
@@ -1,7 +1,21 @@
 import ctypes
-from typing import List, Optional, Any
+import functools
+import logging
+import re
+from typing import Collection, Iterable, List, Optional, Any, Tuple, Union
 import yaml
-from axplorer.macos.lib import lib, get_string_from_pointer
+from axplorer.macos.lib import fast_lib, ffi, lib, get_string_from_cdata, get_string_from_pointer
+
+# Library functions bound once, so calls skip the attribute lookup on lib
+_filterYAMLNodes = lib.filterYAMLNodes
+_filterYAML = lib.filterYAML
+
+logger = logging.getLogger(__name__)
+
+@functools.lru_cache(maxsize=256)
+def _enc(text: Optional[str]) -> Optional[bytes]:
+    """UTF-8 encode a key or value passed to the library, once per distinct string. None stays None."""
+    return text.encode('utf-8') if text is not None else None
 
 def filter_yaml_nodes(yaml_string: str, key: str, value: Optional[Any] = None) -> Optional[str]:
     """
@@ -40,26 +54,48 @@ def filter_yaml_nodes(yaml_string: str, key: str, value: Optional[Any] = None) -
         return None
 
     try:
-        # Convert Python strings to C strings
+        # Convert Python strings to C strings, non-str values are matched by their string form
         yaml_c_string = yaml_string.encode('utf-8')
-        key_c_string = key.encode('utf-8')
-        value_c_string = value.encode('utf-8') if value is not None else None
+        key_c_string = _enc(key)
+        value_c_string = _enc(str(value) if value is not None else None)
 
         # Call the Swift function
-        result = lib.filterYAMLNodes(yaml_c_string, key_c_string, value_c_string)
+        if fast_lib is not None:
+            result = fast_lib.filterYAMLNodes(yaml_c_string, key_c_string,
+                                              value_c_string if value_c_string is not None else ffi.NULL)
+            return get_string_from_cdata(result) if result != ffi.NULL else None
+        result = _filterYAMLNodes(yaml_c_string, key_c_string, value_c_string)
         return get_string_from_pointer(result) if result else None
 
     except Exception as e:
-        print(f"Error filtering YAML nodes: {e}")
+        logger.warning("Error filtering YAML nodes: %s", e)
         return None
 
-def filter_yaml(yaml_string: str, keys: List[str]) -> Optional[str]:
+@functools.lru_cache(maxsize=64)
+def _encode_keys(keys: Collection[str]) -> ctypes.Array:
+    """Build the C array of UTF-8 encoded keys passed to filterYAML, once per key set."""
+    return (ctypes.c_char_p * len(keys))(*[key.encode('utf-8') for key in keys])
+
+@functools.lru_cache(maxsize=64)
+def _encode_keys_cdata(keys: Collection[str]) -> Tuple[Any, List[Any]]:
+    """
+    Build the cffi array of UTF-8 encoded keys passed to fast_lib.filterYAML, once per key set.
+
+    Returns:
+        The array and the key buffers it points to, which must be kept alive with it
+    """
+    buffers = [ffi.new("char[]", key.encode('utf-8')) for key in keys]
+    return ffi.new("const char *[]", buffers), buffers
+
+def filter_yaml(yaml_string: Union[str, bytes], keys: Iterable[str]) -> Optional[str]:
     """
     Filter a YAML string to only include specified keys.
     
     Args:
-        yaml_string: The original YAML string
-        keys: List of keys to keep in the filtered output
+        yaml_string: The original YAML string, or its UTF-8 encoding to skip the encode
+        keys: Keys to keep in the filtered output (list, tuple or frozenset). The encoded keys
+            are cached per key set, so callers filtering repeatedly should pass a constant
+            tuple or frozenset.
         
     Returns:
         Optional[str]: Filtered YAML string, or None if filtering failed
@@ -77,19 +113,61 @@ def filter_yaml(yaml_string: str, keys: List[str]) -> Optional[str]:
         >>> filter_yaml(yaml, ['name', 'role'])
         'name: Button\\nrole: button\\n'
     """
+    if not isinstance(keys, (tuple, frozenset)):
+        keys = tuple(keys)
     if not yaml_string or not keys:
         return None
 
-    try:
-        # Convert Python strings to C strings
-        yaml_c_string = yaml_string.encode('utf-8')
-        keys_c_array = (ctypes.c_char_p * len(keys))(*[key.encode('utf-8') for key in keys])
-        key_count = len(keys)
+    # Convert Python strings to C strings
+    yaml_c_string = yaml_string if isinstance(yaml_string, bytes) else yaml_string.encode('utf-8')
+    key_count = len(keys)
 
+    try:
         # Call the Swift function
-        result = lib.filterYAML(yaml_c_string, keys_c_array, key_count)
+        if fast_lib is not None:
+            result = fast_lib.filterYAML(yaml_c_string, _encode_keys_cdata(keys)[0], key_count)
+            return get_string_from_cdata(result) if result != ffi.NULL else None
+        keys_c_array = _encode_keys(keys)
+        result = _filterYAML(yaml_c_string, keys_c_array, key_count)
         return get_string_from_pointer(result) if result else None
 
     except Exception as e:
-        print(f"Error filtering YAML: {e}")
+        logger.warning("Error filtering YAML: %s", e)
         return None
+
+def compile_key_pattern(keys: Iterable[str]) -> re.Pattern:
+    """
+    Compile a pattern for filter_yaml_str that matches block-style YAML entries for the given keys.
+
+    A match covers the key line plus every following line that is indented deeper than the key
+    (nested mappings, continuation lines), is blank, or is a sequence item at the key's indentation.
+
+    Args:
+        keys: Keys to strip
+
+    Returns:
+        re.Pattern: Compiled pattern, meant to be built once at module load
+    """
+    alternation = "|".join(re.escape(key) for key in sorted(keys))
+    return re.compile(rf"^( *)(?:{alternation}):(?: .*)?(?:\n(?:\1(?: |- ).*|(?=\n)))*\n?", re.MULTILINE)
+
+def filter_yaml_str(yaml_string: str, key_pattern: re.Pattern) -> str:
+    """
+    Remove keys from block-style YAML text without parsing it.
+
+    This is a cheaper alternative to filter_yaml for debug dumps and other text that is only
+    inspected, not re-parsed by the library.
+
+    Args:
+        yaml_string: The original YAML string
+        key_pattern: Pattern built by compile_key_pattern
+
+    Returns:
+        str: YAML string with the matching entries removed
+
+    Example:
+        >>> pattern = compile_key_pattern(["AXFrame"])
+        >>> filter_yaml_str("AXFrame:\\n  x: 1\\n  y: 2\\nAXRole: AXCell\\n", pattern)
+        'AXRole: AXCell\\n'
+    """
+    return key_pattern.sub("", yaml_string)
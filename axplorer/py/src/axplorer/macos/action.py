@@ -1,8 +1,41 @@
 import ctypes
-from typing import List
+import functools
+from itertools import combinations
+from typing import Dict, FrozenSet, List, Tuple
 from axplorer.types import ContextType, ElementId
 from axplorer.macos.lib import lib
-from axplorer.macos.explorer import AccessibilityExplorer
+from axplorer.macos.explorer import AccessibilityExplorer, _encode_context
+
+# Library functions bound once, so calls skip the attribute lookup on lib
+_leftClick = lib.leftClick
+_rightClick = lib.rightClick
+_doubleLeftClick = lib.doubleLeftClick
+_moveToElement = lib.moveToElement
+_scrollUp = lib.scrollUp
+_scrollDown = lib.scrollDown
+_typeText = lib.typeText
+_pressKey = lib.pressKey
+_pressKeyCombo = lib.pressKeyCombo
+_leftDrag = lib.leftDrag
+_dragToElement = lib.dragToElement
+_getMouseLocation = lib.getMouseLocation
+
+# Positions accepted by move_to_element, encoded once
+_POSITIONS = {"center": b"center", "bottomRight": b"bottomRight"}
+
+# Modifier set -> (C array of the encoded modifier names, length), prebuilt for every
+# combination of the valid modifiers since the library only combines their flags
+_MODIFIERS = ("command", "shift", "option", "control", "function")
+_MOD_ARRAYS: Dict[FrozenSet[str], Tuple[ctypes.Array, int]] = {
+    frozenset(subset): ((ctypes.c_char_p * k)(*[m.encode('utf-8') for m in subset]), k)
+    for k in range(len(_MODIFIERS) + 1)
+    for subset in combinations(_MODIFIERS, k)
+}
+
+@functools.lru_cache(maxsize=256)
+def _encode_key(key: str) -> bytes:
+    """UTF-8 encode a key name passed to the library, once per distinct key."""
+    return key.encode('utf-8')
 
 def left_click() -> bool:
     """
@@ -11,7 +44,7 @@ def left_click() -> bool:
     Returns:
         bool: True if successful, False otherwise
     """
-    return lib.leftClick()
+    return _leftClick()
 
 def right_click() -> bool:
     """
@@ -20,7 +53,7 @@ def right_click() -> bool:
     Returns:
         bool: True if successful, False otherwise
     """
-    return lib.rightClick()
+    return _rightClick()
 
 def double_left_click() -> bool:
     """
@@ -29,7 +62,7 @@ def double_left_click() -> bool:
     Returns:
         bool: True if successful, False otherwise
     """
-    return lib.doubleLeftClick()
+    return _doubleLeftClick()
 
 def move_to_element(explorer: AccessibilityExplorer, context_type: ContextType, element_id: ElementId, position: str = "center") -> bool:
     """
@@ -44,15 +77,16 @@ def move_to_element(explorer: AccessibilityExplorer, context_type: ContextType,
     Returns:
         bool: True if successful, False otherwise
     """
-    if position not in ["center", "bottomRight"]:
+    position_bytes = _POSITIONS.get(position)
+    if position_bytes is None:
         print(f"Warning: Invalid position '{position}', defaulting to 'center'")
-        position = "center"
+        position_bytes = _POSITIONS["center"]
         
-    return lib.moveToElement(
+    return _moveToElement(
         explorer.context,
-        context_type.encode('utf-8'),
+        _encode_context(context_type),
         element_id,
-        position.encode('utf-8')
+        position_bytes
     )
 
 def scroll_up(distance: float = 800.0) -> bool:
@@ -65,7 +99,7 @@ def scroll_up(distance: float = 800.0) -> bool:
     Returns:
         bool: True if successful, False otherwise
     """
-    return lib.scrollUp(distance)
+    return _scrollUp(distance)
 
 def scroll_down(distance: float = 800.0) -> bool:
     """
@@ -77,11 +111,13 @@ def scroll_down(distance: float = 800.0) -> bool:
     Returns:
         bool: True if successful, False otherwise
     """
-    return lib.scrollDown(distance)
+    return _scrollDown(distance)
 
 def type_text(text: str) -> bool:
     """
-    Type a string of text with natural timing between keystrokes.
+    Type a string of text, sending each run of plain characters as a single keyboard event.
+    
+    Newlines and tabs are sent as return/tab key presses, so they split the text into runs.
     
     Args:
         text: The text to type (can include any Unicode characters, including emojis)
@@ -97,9 +133,10 @@ def type_text(text: str) -> bool:
         - Complex Unicode sequences
         - Special characters (newlines, tabs)
     """
-    utf16_text = (text.encode("utf-16-le") + b"\x00\x00")
-    utf16_ptr = ctypes.cast(ctypes.create_string_buffer(utf16_text), ctypes.POINTER(ctypes.c_uint16))
-    return lib.typeText(utf16_ptr)
+    utf16_text = text.encode("utf-16-le") + b"\x00\x00"
+    # A uint16 array converts to the POINTER(c_uint16) argument as is, no buffer or cast needed
+    utf16_array = (ctypes.c_uint16 * (len(utf16_text) // 2)).from_buffer_copy(utf16_text)
+    return _typeText(utf16_array)
 
 def press_key(key: str) -> bool:
     """
@@ -123,9 +160,7 @@ def press_key(key: str) -> bool:
     if not key:
         return False
         
-    # Convert the key string to UTF-8 bytes for C
-    key_bytes = key.encode('utf-8')
-    return lib.pressKey(key_bytes)
+    return _pressKey(_encode_key(key))
 
 def press_key_combo(key: str, modifiers: List[str]) -> bool:
     """
@@ -149,13 +184,16 @@ def press_key_combo(key: str, modifiers: List[str]) -> bool:
     if not key:
         return False
         
-    # Convert modifiers to UTF-8 since they're ASCII-only
-    modifier_bytes = [m.encode('utf-8') for m in modifiers]
-    arr = (ctypes.c_char_p * len(modifier_bytes))(*modifier_bytes)
-    
-    # Convert the key string to UTF-8 bytes for C
-    key_bytes = key.encode('utf-8')
-    return lib.pressKeyCombo(key_bytes, arr, len(modifiers))
+    # Look up the prebuilt modifier array, building and keeping it for unknown modifiers
+    modifier_set = frozenset(modifiers)
+    entry = _MOD_ARRAYS.get(modifier_set)
+    if entry is None:
+        entry = _MOD_ARRAYS[modifier_set] = (
+            (ctypes.c_char_p * len(modifier_set))(*[m.encode('utf-8') for m in modifier_set]),
+            len(modifier_set)
+        )
+    arr, count = entry
+    return _pressKeyCombo(_encode_key(key), arr, count)
 
 def left_drag(to_x: float, to_y: float) -> bool:
     """
@@ -172,7 +210,7 @@ def left_drag(to_x: float, to_y: float) -> bool:
         This function assumes the mouse button is already pressed at the starting position.
         Use this for dragging from the current mouse position to absolute screen coordinates.
     """
-    return lib.leftDrag(to_x, to_y)
+    return _leftDrag(to_x, to_y)
 
 def drag_to_element(explorer: AccessibilityExplorer, context_type: ContextType, element_id: ElementId) -> bool:
     """
@@ -186,9 +224,9 @@ def drag_to_element(explorer: AccessibilityExplorer, context_type: ContextType,
     Returns:
         bool: True if successful, False otherwise
     """
-    return lib.dragToElement(
+    return _dragToElement(
         explorer.context,
-        context_type.encode('utf-8'),
+        _encode_context(context_type),
         element_id
     )
 
@@ -200,8 +238,7 @@ def get_mouse_location() -> tuple[float, float]:
         tuple[float, float]: A tuple containing the (x, y) coordinates of the mouse cursor,
         or (0.0, 0.0) if the location could not be retrieved.
     """
-    x = ctypes.c_double()
-    y = ctypes.c_double()
-    if lib.getMouseLocation(ctypes.byref(x), ctypes.byref(y)):
-        return (x.value, y.value)
+    point = (ctypes.c_double * 2)()
+    if _getMouseLocation(point):
+        return (point[0], point[1])
     return (0.0, 0.0)
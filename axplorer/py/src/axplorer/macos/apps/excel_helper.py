@@ -1,18 +1,31 @@
 """
 Excel-specific helper functions for accessibility testing.
 """
-from axplorer.common.yaml import filter_yaml
+import hashlib
+import threading
+from collections import OrderedDict
+
 from axplorer.macos.explorer import AccessibilityExplorer
-from axplorer.macos.lib import lib, get_string_from_pointer
+from axplorer.macos.lib import fast_lib, lib, get_string_from_cdata, get_string_from_pointer
+
+# Library functions bound once, so calls skip the attribute lookup on lib
+_flattenExcelCells = lib.flattenExcelCells
+_flattenExcelCellsFast = lib.flattenExcelCellsFast
+
+# Number of flatten_and_filter results kept, keyed by a hash of the input YAML
+FLATTEN_CACHE_SIZE = 8
 
-def flatten_excel_cells(yaml_str: str) -> str:
+_flatten_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_flatten_cache_lock = threading.Lock()
+
+def flatten_excel_cells(yaml_str: str | bytes) -> str:
     """
     Flattens Excel cell elements in a YAML hierarchy by merging child attributes
     into parents and removing the children. This is useful for Excel cells that
     may have nested structure but should be treated as a single element.
     
     Args:
-        yaml_str: YAML string containing Excel cell elements
+        yaml_str: YAML string containing Excel cell elements, or its UTF-8 encoding to skip the encode
         
     Returns:
         Processed YAML string with flattened Excel cells, or empty string if processing fails
@@ -38,21 +51,45 @@ def flatten_excel_cells(yaml_str: str) -> str:
             AXDescription: "Cell A1"
             AXValue: 42
     """
-    yaml_bytes = yaml_str.encode('utf-8')
-    result_ptr = lib.flattenExcelCells(yaml_bytes)
+    yaml_bytes = yaml_str if isinstance(yaml_str, bytes) else yaml_str.encode('utf-8')
+    if fast_lib is not None:
+        return get_string_from_cdata(fast_lib.flattenExcelCells(yaml_bytes))
+    result_ptr = _flattenExcelCells(yaml_bytes)
     return get_string_from_pointer(result_ptr)
 
 
-def flatten_and_filter(excel_state):
-    keys_to_remove = ["AXFrame", "AXPosition", "AXSize", "AXRectInParentSpace", "AXVisibleCharacterRange", "AXSharedCharacterRange", 
-                        "AXSelectedTextRange", "AXNumberOfCharacters", "AXInsertionPointLineNumber", "AXFocused", "AXColumnIndexRange",
-                        "AXRowIndexRange", "AXOrientation"]
-    excel_state = filter_yaml(excel_state, keys_to_remove)
-    return flatten_excel_cells(excel_state)
+def flatten_and_filter(excel_state: str | bytes) -> str:
+    """
+    Remove the noisy geometry and editing-state attributes from Excel window YAML and flatten its cells.
+
+    The YAML may be passed UTF-8 encoded, as returned by get_main_window_yaml_bytes, to skip the encode.
+
+    Both passes run in a single native call that parses and dumps the YAML once, with the attributes
+    to remove fixed on the native side. The result is pure, so it is kept in a small LRU cache keyed by a hash of the input,
+    and polling an unchanged window skips the native call.
+    """
+    yaml_bytes = excel_state if isinstance(excel_state, bytes) else excel_state.encode('utf-8')
+    key = hashlib.blake2b(yaml_bytes, digest_size=16).digest()
+    with _flatten_cache_lock:
+        cached = _flatten_cache.get(key)
+        if cached is not None:
+            _flatten_cache.move_to_end(key)
+            return cached
+
+    if fast_lib is not None:
+        result = get_string_from_cdata(fast_lib.flattenExcelCellsFast(yaml_bytes))
+    else:
+        result = get_string_from_pointer(_flattenExcelCellsFast(yaml_bytes))
+    with _flatten_cache_lock:
+        _flatten_cache[key] = result
+        if len(_flatten_cache) > FLATTEN_CACHE_SIZE:
+            _flatten_cache.popitem(last=False)
+    return result
 
 
 def get_compact_excel_yaml(explorer : AccessibilityExplorer)-> str | None:
-    excel_state = explorer.get_main_window_yaml(50)
+    # Kept UTF-8 encoded, only the compact result is decoded
+    excel_state = explorer.get_main_window_yaml_bytes(50)
     if excel_state:
         return flatten_and_filter(excel_state)
 
@@ -1,6 +1,37 @@
-from typing import Optional, List
+import ctypes
+import weakref
+from typing import Callable, Iterable, Optional, List, Tuple
 from ..types import ContextPointer, ElementId, ContextType, ActionName, AttributeName, AttributeValue
-from .lib import lib, get_string_from_pointer, create_value_pointer
+from .utils import launch_application, raise_application
+from .lib import (
+    fast_lib, ffi, lib, get_bytes_from_cdata, get_bytes_from_pointer, get_string_from_cdata, get_string_from_pointer,
+    create_value_pointer, ChangeCallback
+)
+
+# Library functions bound once, so calls skip the attribute lookup on lib
+_createAccessExplorer = lib.createAccessExplorer
+_destroyAccessExplorer = lib.destroyAccessExplorer
+_installObserver = lib.installObserver
+_removeObserver = lib.removeObserver
+_getAppYAML = lib.getAppYAML
+_getMainWindowYAML = lib.getMainWindowYAML
+_dumpMainWindowYAML = lib.dumpMainWindowYAML
+_getMainWindowFingerprint = lib.getMainWindowFingerprint
+_getFocusedWindowYAML = lib.getFocusedWindowYAML
+_getMenuBarYAML = lib.getMenuBarYAML
+_getElementAtMousePositionYAML = lib.getElementAtMousePositionYAML
+_getQueryElementYAML = lib.getQueryElementYAML
+_performAction = lib.performAction
+_performActions = lib.performActions
+_setAttributeValue = lib.setAttributeValue
+
+# Context types encoded once, they are passed to the library on every element call
+_CTX = {context_type: context_type.encode('utf-8') for context_type in ("App", "Main", "Menu", "Focused", "Query")}
+
+def _encode_context(context_type: ContextType) -> bytes:
+    """Get the UTF-8 encoded context type, encoding unknown ones on the fly."""
+    encoded = _CTX.get(context_type)
+    return encoded if encoded is not None else context_type.encode('utf-8')
 
 class AccessibilityExplorer:
     """
@@ -14,9 +45,15 @@ class AccessibilityExplorer:
         Args:
             app_name: Name of the application to explore
         """
-        self.context = lib.createAccessExplorer(app_name.encode('utf-8'))
+        self._observer_callback = None
+        self._state_token = 0  # Counts UI changes reported by the observer
+        self.app_name = app_name
+        self.context = _createAccessExplorer(app_name.encode('utf-8'))
         if not self.context:
             raise RuntimeError(f"Failed to create AccessibilityExplorer for {app_name}")
+        # Destroys the context once the explorer is collected or the interpreter exits, unless
+        # cleanup() ran first. Unlike __del__, this does not keep reference cycles from being collected.
+        self._finalizer = weakref.finalize(self, _destroyAccessExplorer, self.context)
     
     def __enter__(self):
         """Context manager entry point."""
@@ -25,16 +62,76 @@ class AccessibilityExplorer:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit point."""
         self.cleanup()
-        
-    def __del__(self):
-        """Destructor to ensure cleanup."""
-        self.cleanup()
     
     def cleanup(self):
         """Clean up the explorer context."""
-        if hasattr(self, 'context') and self.context:
-            lib.destroyAccessExplorer(self.context)
+        if self.context:
+            self._finalizer()
             self.context = None
+            self._observer_callback = None
+
+    def raise_application(self) -> bool:
+        """
+        Raise (bring to front) the explored application.
+        
+        Returns:
+            bool: True if the application was successfully raised, False otherwise
+        """
+        return raise_application(self.app_name)
+
+    def launch_application(self) -> bool:
+        """
+        Launch the explored application and wait for it to be ready.
+        
+        Returns:
+            bool: True if the application was successfully launched and ready, False otherwise
+        """
+        return launch_application(self.app_name)
+
+    def install_observer(self, callback: Callable[[], None]) -> bool:
+        """
+        Install an accessibility observer that calls back whenever the application's UI changes.
+
+        Value, focus, creation and destruction notifications are observed. Any previously
+        installed observer is replaced. Each notification also advances state_token().
+
+        Args:
+            callback: Function taking no arguments
+
+        Returns:
+            bool: True if successful, False otherwise
+
+        Note:
+            The callback runs on a native background thread, so it should only record
+            the change (e.g. set a flag) and return quickly.
+        """
+        def on_change():
+            self._state_token += 1
+            callback()
+
+        c_callback = ChangeCallback(on_change)
+        if not _installObserver(self.context, c_callback):
+            return False
+        # The native observer only holds the function pointer, so keep the ctypes thunk alive
+        self._observer_callback = c_callback
+        return True
+
+    def state_token(self) -> Optional[int]:
+        """
+        Get a token that changes whenever the observer reports a UI change.
+
+        Callers can keep derived state (such as the window YAML) while the token is unchanged.
+
+        Returns:
+            int: Current token, or None if no observer is installed and changes are not tracked
+        """
+        return self._state_token if self._observer_callback is not None else None
+
+    def remove_observer(self) -> None:
+        """Remove the observer installed by install_observer, if any."""
+        if self.context:
+            _removeObserver(self.context)
+        self._observer_callback = None
 
     def get_app_yaml(self, max_depth: int) -> Optional[str]:
         """
@@ -46,7 +143,7 @@ class AccessibilityExplorer:
         Returns:
             str: YAML string if successful, None otherwise
         """
-        result = lib.getAppYAML(self.context, max_depth)
+        result = _getAppYAML(self.context, max_depth)
         return get_string_from_pointer(result) if result else None
 
     def get_main_window_yaml(self, max_depth: int) -> Optional[str]:
@@ -59,9 +156,61 @@ class AccessibilityExplorer:
         Returns:
             str: YAML string if successful, None otherwise
         """
-        result = lib.getMainWindowYAML(self.context, max_depth)
+        if fast_lib is not None:
+            result = fast_lib.getMainWindowYAML(ffi.cast("void *", self.context), max_depth)
+            return get_string_from_cdata(result) if result != ffi.NULL else None
+        result = _getMainWindowYAML(self.context, max_depth)
         return get_string_from_pointer(result) if result else None
 
+    def get_main_window_yaml_bytes(self, max_depth: int) -> Optional[bytes]:
+        """
+        Get the UTF-8 encoded YAML representation of the main window.
+
+        Use this when the YAML is handed straight back to the library (filter_yaml,
+        flatten_excel_cells), so it is not decoded to a str only to be encoded again.
+
+        Args:
+            max_depth: Maximum depth to traverse
+
+        Returns:
+            bytes: UTF-8 encoded YAML if successful, None otherwise
+        """
+        if fast_lib is not None:
+            result = fast_lib.getMainWindowYAML(ffi.cast("void *", self.context), max_depth)
+            return get_bytes_from_cdata(result) if result != ffi.NULL else None
+        result = _getMainWindowYAML(self.context, max_depth)
+        return get_bytes_from_pointer(result) if result else None
+
+    def dump_main_window_yaml(self, path: str, max_depth: int) -> bool:
+        """
+        Write the YAML representation of the main window directly to a file.
+
+        The YAML is written by the native library, so no Python string is built.
+        Use this for debug dumps where the YAML is not consumed in-process.
+
+        Args:
+            path: File to write
+            max_depth: Maximum depth to traverse
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return _dumpMainWindowYAML(self.context, path.encode('utf-8'), max_depth)
+
+    def get_main_window_fingerprint(self) -> Optional[int]:
+        """
+        Get a cheap fingerprint of the main window state.
+
+        The fingerprint covers the window title, frame and child count plus the
+        focused element, without walking the hierarchy. It changes when the
+        visible state changes, so callers can skip redundant get_main_window_yaml calls.
+
+        Returns:
+            int: Non-zero fingerprint if successful, None otherwise
+        """
+        fingerprint = _getMainWindowFingerprint(self.context)
+        return fingerprint or None
+
     def get_focused_window_yaml(self, max_depth: int) -> Optional[str]:
         """
         Get YAML representation of the focused window.
@@ -72,7 +221,7 @@ class AccessibilityExplorer:
         Returns:
             str: YAML string if successful, None otherwise
         """
-        result = lib.getFocusedWindowYAML(self.context, max_depth)
+        result = _getFocusedWindowYAML(self.context, max_depth)
         return get_string_from_pointer(result) if result else None
 
     def get_menu_bar_yaml(self, max_depth: int) -> Optional[str]:
@@ -85,7 +234,7 @@ class AccessibilityExplorer:
         Returns:
             str: YAML string if successful, None otherwise
         """
-        result = lib.getMenuBarYAML(self.context, max_depth)
+        result = _getMenuBarYAML(self.context, max_depth)
         return get_string_from_pointer(result) if result else None
 
     def get_element_at_mouse_position_yaml(self, max_depth: int = 2) -> Optional[str]:
@@ -98,7 +247,7 @@ class AccessibilityExplorer:
         Returns:
             str: YAML string if successful, None otherwise
         """
-        result = lib.getElementAtMousePositionYAML(self.context, max_depth)
+        result = _getElementAtMousePositionYAML(self.context, max_depth)
         return get_string_from_pointer(result) if result else None
 
     def get_query_element_yaml(self, context_type: ContextType, idx: ElementId, max_depth: int) -> Optional[str]:
@@ -113,9 +262,9 @@ class AccessibilityExplorer:
         Returns:
             str: YAML string if successful, None otherwise
         """
-        result = lib.getQueryElementYAML(
+        result = _getQueryElementYAML(
             self.context,
-            context_type.encode('utf-8'),
+            _encode_context(context_type),
             idx,
             max_depth
         )
@@ -133,13 +282,43 @@ class AccessibilityExplorer:
         Returns:
             bool: True if successful, False otherwise
         """
-        return lib.performAction(
+        return _performAction(
             self.context,
-            context_type.encode('utf-8'),
+            _encode_context(context_type),
             element_id,
             action.encode('utf-8')
         )
 
+    def perform_actions(self, actions: Iterable[Tuple[ContextType, ElementId, ActionName]]) -> List[bool]:
+        """
+        Perform a batch of accessibility actions in a single library call.
+        
+        The actions are passed to the library as parallel arrays, so the per-call overhead
+        of perform_action is paid once for the whole batch. They run in order.
+        
+        Args:
+            actions: (context_type, element_id, action) triples, as taken by perform_action
+            
+        Returns:
+            List[bool]: Whether each action was performed successfully
+        """
+        actions = list(actions)
+        count = len(actions)
+        if not count:
+            return []
+        
+        context_types = (ctypes.c_char_p * count)()
+        element_ids = (ctypes.c_ssize_t * count)()
+        action_names = (ctypes.c_char_p * count)()
+        for i, (context_type, element_id, action) in enumerate(actions):
+            context_types[i] = _encode_context(context_type)
+            element_ids[i] = element_id
+            action_names[i] = action.encode('utf-8')
+        
+        results = (ctypes.c_bool * count)()
+        _performActions(self.context, context_types, element_ids, action_names, results, count)
+        return list(results)
+
     def set_attribute_value(self, context_type: ContextType, element_id: ElementId, 
                           attribute: AttributeName, value: AttributeValue) -> bool:
         """
@@ -156,9 +335,9 @@ class AccessibilityExplorer:
         """
         value_ptr, value_type = create_value_pointer(value)
         
-        return lib.setAttributeValue(
+        return _setAttributeValue(
             self.context,
-            context_type.encode('utf-8'),
+            _encode_context(context_type),
             element_id,
             attribute.encode('utf-8'),
             value_ptr,
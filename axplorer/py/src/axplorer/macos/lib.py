@@ -5,12 +5,40 @@ from ..types import AttributeValue
 
 # Load the Swift library
 # TODO: Update path to use proper library location after build
-lib = ctypes.CDLL(os.path.join(os.path.dirname(__file__), 'lib/libAXplorer.dylib'))
+LIB_PATH = os.path.join(os.path.dirname(__file__), 'lib/libAXplorer.dylib')
+lib = ctypes.CDLL(LIB_PATH)
 
 # Load libc for memory management
 libc = ctypes.CDLL("libc.dylib")
 free = libc.free
 free.argtypes = [ctypes.c_void_p]
+strlen = libc.strlen
+strlen.argtypes = [ctypes.c_void_p]
+strlen.restype = ctypes.c_size_t
+
+# The string-heavy functions on the hot path are also bound through cffi, whose calls cost less
+# than ctypes calls. cffi is optional: when it is missing, fast_lib is None and callers use lib.
+try:
+    from cffi import FFI
+except ImportError:
+    ffi = None
+    fast_lib = None
+else:
+    ffi = FFI()
+    ffi.cdef("""
+        char *getMainWindowYAML(void *context, long maxDepth);
+        char *filterYAML(const char *yaml, const char **keys, long keyCount);
+        char *filterYAMLNodes(const char *yaml, const char *key, const char *value);
+        char *flattenExcelCells(const char *yaml);
+        char *flattenExcelCellsFast(const char *yaml);
+        void free(void *ptr);
+        size_t strlen(const char *s);
+    """)
+    fast_lib = ffi.dlopen(LIB_PATH)
+    _fast_libc = ffi.dlopen("libc.dylib")
+
+# C callback type used by installObserver
+ChangeCallback = ctypes.CFUNCTYPE(None)
 
 # Configure function signatures
 def _configure_lib():
@@ -30,6 +58,12 @@ def _configure_lib():
     lib.destroyAccessExplorer.argtypes = [ctypes.c_void_p]
     lib.destroyAccessExplorer.restype = None
 
+    lib.installObserver.argtypes = [ctypes.c_void_p, ChangeCallback]
+    lib.installObserver.restype = ctypes.c_bool
+
+    lib.removeObserver.argtypes = [ctypes.c_void_p]
+    lib.removeObserver.restype = None
+
     # YAML operations
     lib.getAppYAML.argtypes = [ctypes.c_void_p, ctypes.c_int]
     lib.getAppYAML.restype = ctypes.POINTER(ctypes.c_char)
@@ -43,6 +77,12 @@ def _configure_lib():
     lib.getMenuBarYAML.argtypes = [ctypes.c_void_p, ctypes.c_int]
     lib.getMenuBarYAML.restype = ctypes.POINTER(ctypes.c_char)
 
+    lib.dumpMainWindowYAML.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+    lib.dumpMainWindowYAML.restype = ctypes.c_bool
+
+    lib.getMainWindowFingerprint.argtypes = [ctypes.c_void_p]
+    lib.getMainWindowFingerprint.restype = ctypes.c_uint64
+
     lib.getQueryElementYAML.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int, ctypes.c_int]
     lib.getQueryElementYAML.restype = ctypes.POINTER(ctypes.c_char)
 
@@ -50,6 +90,10 @@ def _configure_lib():
     lib.performAction.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p]
     lib.performAction.restype = ctypes.c_bool
 
+    lib.performActions.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_char_p), ctypes.POINTER(ctypes.c_ssize_t),
+                                   ctypes.POINTER(ctypes.c_char_p), ctypes.POINTER(ctypes.c_bool), ctypes.c_size_t]
+    lib.performActions.restype = ctypes.c_ssize_t
+
     lib.setAttributeValue.argtypes = [
         ctypes.c_void_p,
         ctypes.c_char_p,
@@ -96,7 +140,7 @@ def _configure_lib():
     lib.dragToElement.restype = ctypes.c_bool
 
     # Mouse location
-    lib.getMouseLocation.argtypes = [ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double)]
+    lib.getMouseLocation.argtypes = [ctypes.POINTER(ctypes.c_double)]
     lib.getMouseLocation.restype = ctypes.c_bool
 
     # Element at mouse position
@@ -107,6 +151,9 @@ def _configure_lib():
     lib.flattenExcelCells.argtypes = [ctypes.c_char_p]
     lib.flattenExcelCells.restype = ctypes.POINTER(ctypes.c_char)
 
+    lib.flattenExcelCellsFast.argtypes = [ctypes.c_char_p]
+    lib.flattenExcelCellsFast.restype = ctypes.POINTER(ctypes.c_char)
+
 
 # Configure library on import
 _configure_lib()
@@ -115,16 +162,49 @@ def get_string_from_pointer(ptr: ctypes.POINTER) -> str:
     """Convert a C string pointer to a Python string and free the memory."""
     if not ptr:
         return ""
-    result = ctypes.string_at(ptr).decode('utf-8')
+    # Decode straight from the C buffer, without first copying it into a bytes object
+    address = ctypes.addressof(ptr.contents)
+    result = str((ctypes.c_char * strlen(address)).from_address(address), 'utf-8')
+    free(ptr)
+    return result
+
+def get_bytes_from_pointer(ptr: ctypes.POINTER) -> bytes:
+    """Copy a C string pointer into Python bytes, without decoding it, and free the memory."""
+    if not ptr:
+        return b""
+    result = ctypes.string_at(ptr)
     free(ptr)
     return result
 
+def get_bytes_from_cdata(ptr: Any) -> bytes:
+    """Copy a C string returned by a fast_lib function into Python bytes, without decoding it, and free the memory."""
+    if ptr == ffi.NULL:
+        return b""
+    result = ffi.string(ptr)
+    _fast_libc.free(ptr)
+    return result
+
+def get_string_from_cdata(ptr: Any) -> str:
+    """Convert a C string returned by a fast_lib function to a Python string and free the memory."""
+    if ptr == ffi.NULL:
+        return ""
+    # Decode straight from the C buffer, without first copying it into a bytes object
+    result = str(ffi.buffer(ptr, _fast_libc.strlen(ptr)), 'utf-8')
+    _fast_libc.free(ptr)
+    return result
+
+# Shared pointers for boolean attribute values, the library only reads them
+_TRUE_PTR = ctypes.pointer(ctypes.c_bool(True))
+_FALSE_PTR = ctypes.pointer(ctypes.c_bool(False))
+
 def create_value_pointer(value: AttributeValue) -> tuple[Any, str]:
     """Create a ctypes pointer for a value based on its type."""
     if isinstance(value, str):
-        return ctypes.create_string_buffer(value.encode('utf-8')), "string"
+        # The library only reads the string, so point at the encoded bytes instead of copying
+        # them into a writable buffer. The c_char_p keeps the bytes alive.
+        return ctypes.c_char_p(value.encode('utf-8')), "string"
     elif isinstance(value, bool):
-        return ctypes.pointer(ctypes.c_bool(value)), "bool"
+        return (_TRUE_PTR if value else _FALSE_PTR), "bool"
     elif isinstance(value, (int, float)):
         return ctypes.pointer(ctypes.c_double(value)), "double"
     else:
@@ -1,23 +1,45 @@
 import ctypes
+import functools
+import logging
+from typing import Optional, Set
 from AppKit import NSWorkspace
 from axplorer.macos.lib import lib
 
-def is_accessibility_enabled() -> bool:
+logger = logging.getLogger(__name__)
+
+# ApplicationServices framework, loaded by the first is_accessibility_enabled call
+_app_services: Optional[ctypes.CDLL] = None
+# Set once accessibility permissions were found enabled, they are not expected to be revoked while running
+_accessibility_state: Optional[bool] = None
+
+def is_accessibility_enabled(force: bool = False) -> bool:
     """
     Check if Accessibility permissions are enabled for this process.
     
+    A granted permission is remembered, so later calls return without asking the system.
+    A missing one is checked again on every call, so polling for the user to grant it works.
+    
+    Args:
+        force: Ask the system even if the permission was found enabled before
+    
     Returns:
         bool: True if accessibility is enabled, False otherwise
     """
+    global _app_services, _accessibility_state
+    if _accessibility_state and not force:
+        return True
     try:
-        # Load ApplicationServices Framework
-        app_services = ctypes.CDLL("/System/Library/Frameworks/ApplicationServices.framework/ApplicationServices")
+        if _app_services is None:
+            # Load ApplicationServices Framework
+            app_services = ctypes.CDLL("/System/Library/Frameworks/ApplicationServices.framework/ApplicationServices")
+            app_services.AXIsProcessTrusted.restype = ctypes.c_bool
+            _app_services = app_services
         
         # Check AXIsProcessTrusted
-        app_services.AXIsProcessTrusted.restype = ctypes.c_bool
-        return bool(app_services.AXIsProcessTrusted())
+        _accessibility_state = bool(_app_services.AXIsProcessTrusted())
+        return _accessibility_state
     except Exception as e:
-        print(f"Error checking accessibility permissions: {e}")
+        logger.warning("Error checking accessibility permissions: %s", e)
         return False
 
 def prompt_accessibility_permissions():
@@ -32,6 +54,11 @@ def prompt_accessibility_permissions():
     else:
         print("Accessibility permissions are already granted.")
 
+@functools.lru_cache(maxsize=32)
+def _app_bytes(app_name: str) -> bytes:
+    """UTF-8 encode an application name passed to the library, once per application."""
+    return app_name.encode('utf-8')
+
 def raise_application(app_name: str) -> bool:
     """
     Raise (bring to front) an application with the specified name.
@@ -46,12 +73,20 @@ def raise_application(app_name: str) -> bool:
         >>> raise_application('Safari')
         True
     """
+    app_name_bytes = _app_bytes(app_name)
     try:
-        return lib.raiseApplication(app_name.encode('utf-8'))
+        return lib.raiseApplication(app_name_bytes)
     except Exception as e:
-        print(f"Error raising application: {e}")
+        logger.warning("Error raising application: %s", e)
         return False
 
+# Names of the applications launched by launch_application
+_launched_apps: Set[str] = set()
+
+def _is_running(app_name: str) -> bool:
+    """Check whether an application with the given name is running."""
+    return any(app.localizedName() == app_name for app in NSWorkspace.sharedWorkspace().runningApplications())
+
 def launch_application(app_name: str, timeout: float = 30.0) -> bool:
     """
     Launch an application with the specified name and wait for it to be ready.
@@ -67,12 +102,21 @@ def launch_application(app_name: str, timeout: float = 30.0) -> bool:
         >>> launch_application('Safari')
         True
     """
+    # An application launched before is only launched again once it has quit
+    if app_name in _launched_apps:
+        if _is_running(app_name):
+            return True
+        _launched_apps.discard(app_name)
+    
+    app_name_bytes = _app_bytes(app_name)
     try:
         # The Swift implementation now handles the waiting internally
-        result = lib.launchApplication(app_name.encode('utf-8'))
-        if not result:
-            print(f"Failed to launch application '{app_name}'")
-            return False
+        result = lib.launchApplication(app_name_bytes)
     except Exception as e:
-        print(f"Error launching application: {e}")
+        logger.warning("Error launching application: %s", e)
+        return False
+    if not result:
+        logger.warning("Failed to launch application '%s'", app_name)
         return False
+    _launched_apps.add(app_name)
+    return True
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+from examples.utils.yaml_delta import YamlDeltaTracker
+from examples.utils.yaml_helper import yaml_dump, yaml_load
+
+def _compact_window(a1_value: int) -> str:
+    """Build compact Excel state YAML with flattened cells, which keep value and cell at the top level."""
+    cells = {
+        f"element{row}": {"aid": row, "value": a1_value if row == 1 else row, "cell": f"A{row}"}
+        for row in range(1, 21)
+    }
+    return yaml_dump({
+        "window": {
+            "aid": 0,
+            "attributes": {"AXRole": "AXWindow", "AXTitle": "Book1"},
+            "children": {
+                "table": {
+                    "aid": 100,
+                    "attributes": {"AXRole": "AXTable"},
+                    "children": cells,
+                },
+            },
+        },
+    })
+
+def test_flattened_cell_value_change():
+    tracker = YamlDeltaTracker()
+    assert tracker.update(_compact_window(1)) is None
+
+    delta = tracker.update(_compact_window(99))
+    assert delta is not None
+    delta = yaml_load(delta)
+
+    assert delta["changed"]["window/table/element1"] == {"aid": 1, "value": 99, "cell": "A1"}
+    assert "window/table/element2" in delta["unchanged_roots"]
+    assert "window" not in delta["unchanged_roots"]
+
+def test_unchanged_window():
+    tracker = YamlDeltaTracker()
+    tracker.update(_compact_window(1))
+
+    delta = yaml_load(tracker.update(_compact_window(1)))
+    assert delta["changed"] == {}
+    assert delta["unchanged_roots"] == ["window"]
+
+if __name__ == "__main__":
+    test_flattened_cell_value_change()
+    test_unchanged_window()
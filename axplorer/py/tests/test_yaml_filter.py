@@ -1,23 +1,72 @@
 #!/usr/bin/env python3
-from axplorer.common.yaml import filter_yaml_by_key_value
+import time
+
+import yaml
+
+from axplorer.common.yaml import filter_yaml_nodes
+
+# Nodes in the synthetic tree of the timing test, and the time filtering it may take
+LARGE_TREE_NODES = 10_000
+LARGE_TREE_BUDGET_S = 5.0
+
+def _synthetic_tree(node_count: int) -> str:
+    """Build YAML for a tree of node_count elements, every other one an AXCell with a child."""
+    tree = {}
+    for aid in range(0, node_count, 2):
+        role = "AXCell" if aid % 4 == 0 else "AXButton"
+        tree[f"element{aid}"] = {
+            "aid": aid,
+            "attributes": {"name": f"Element{aid}", "role": role},
+            "children": {
+                f"element{aid + 1}": {
+                    "aid": aid + 1,
+                    "attributes": {"name": f"Label{aid + 1}", "role": "AXStaticText"},
+                },
+            },
+        }
+    return yaml.safe_dump(tree)
 
 def test_filter_yaml():
     # Test YAML content
     yaml_content = """
-- name: Button1
-  role: AXCell
-  value: 123
-- name: Button2
-  role: AXButton
-  value: 456
+element1:
+  aid: 1
+  attributes:
+    name: Button1
+    role: AXCell
+    value: 123
+element2:
+  aid: 2
+  attributes:
+    name: Button2
+    role: AXButton
+    value: 456
 """
-    
+
     # Test filtering by role=AXCell
-    filtered = filter_yaml_by_key_value(yaml_content, 'role', 'AXCell')
+    filtered = filter_yaml_nodes(yaml_content, 'role', 'AXCell')
     print("Original YAML:")
     print(yaml_content)
     print("\nFiltered YAML (excluding role=AXCell):")
     print(filtered)
 
+    assert filtered is not None
+    assert "Button1" not in filtered
+    assert "Button2" in filtered
+
+def test_filter_yaml_large_tree():
+    yaml_content = _synthetic_tree(LARGE_TREE_NODES)
+
+    start = time.perf_counter()
+    filtered = filter_yaml_nodes(yaml_content, 'role', 'AXCell')
+    elapsed = time.perf_counter() - start
+    print(f"Filtered {LARGE_TREE_NODES} nodes in {elapsed:.3f}s")
+
+    assert filtered is not None
+    assert "AXCell" not in filtered
+    assert "AXButton" in filtered
+    assert elapsed < LARGE_TREE_BUDGET_S, f"filter_yaml_nodes took {elapsed:.3f}s, budget is {LARGE_TREE_BUDGET_S}s"
+
 if __name__ == "__main__":
     test_filter_yaml()
+    test_filter_yaml_large_tree()